@@ -1,5 +1,5 @@
 """Chess game logic module."""
 
-from .pieces import Piece, PieceType, PlayerType, NO_PIECE
+from .pieces import PIECES, Piece, PieceType, PlayerType, NO_PIECE
 
-__all__ = ["Piece", "PieceType", "PlayerType", "NO_PIECE"]
+__all__ = ["Piece", "PieceType", "PlayerType", "NO_PIECE", "PIECES"]
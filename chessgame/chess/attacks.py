@@ -0,0 +1,109 @@
+"""Precomputed attack tables for bitboard move generation."""
+
+from .bitboard import BB_ALL, FILE_A, FILE_H, RANK_3, RANK_6
+from .pieces import PlayerType
+
+# Ray directions as (row_step, col_step)
+ROOK_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+BISHOP_DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+KNIGHT_OFFSETS = (
+    (-2, -1),
+    (-2, 1),
+    (-1, -2),
+    (-1, 2),
+    (1, -2),
+    (1, 2),
+    (2, -1),
+    (2, 1),
+)
+KING_OFFSETS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+
+
+def _offset_attacks(sq: int, offsets: tuple[tuple[int, int], ...]) -> int:
+    """Bitboard of the on-board squares reached by jumping by each offset."""
+    row, col = divmod(sq, 8)
+    attacks = 0
+    for row_step, col_step in offsets:
+        to_row = row + row_step
+        to_col = col + col_step
+        if 0 <= to_row < 8 and 0 <= to_col < 8:
+            attacks |= 1 << (to_row * 8 + to_col)
+    return attacks
+
+
+# Squares attacked by a knight or king standing on each square
+KNIGHT_ATTACKS = tuple(_offset_attacks(sq, KNIGHT_OFFSETS) for sq in range(64))
+KING_ATTACKS = tuple(_offset_attacks(sq, KING_OFFSETS) for sq in range(64))
+
+
+def ray_attacks(sq: int, occ: int, directions: tuple[tuple[int, int], ...]) -> int:
+    """Bitboard of squares attacked along each ray, stopping at blockers."""
+    row, col = divmod(sq, 8)
+    attacks = 0
+    for row_step, col_step in directions:
+        to_row = row + row_step
+        to_col = col + col_step
+        while 0 <= to_row < 8 and 0 <= to_col < 8:
+            bit = 1 << (to_row * 8 + to_col)
+            attacks |= bit
+            if occ & bit:
+                break
+            to_row += row_step
+            to_col += col_step
+    return attacks
+
+
+def pawn_attacks(pawns: int, owner: PlayerType) -> int:
+    """Bitboard of squares attacked diagonally by the given pawns."""
+    if owner == PlayerType.WHITE:
+        return ((pawns >> 9) & ~FILE_H) | ((pawns >> 7) & ~FILE_A)
+    return (((pawns << 7) & ~FILE_H) | ((pawns << 9) & ~FILE_A)) & BB_ALL
+
+
+# Squares attacked by a pawn of each color standing on each square, indexed
+# by the owner's int code
+PAWN_ATTACKS = tuple(
+    tuple(pawn_attacks(1 << sq, owner) for sq in range(64))
+    for owner in (PlayerType.WHITE, PlayerType.BLACK)
+)
+
+
+def pawn_pushes(pawns: int, owner: PlayerType, empty: int) -> tuple[int, int]:
+    """Returns the (single, double) push destinations of all the given pawns."""
+    if owner == PlayerType.WHITE:
+        single = (pawns >> 8) & empty
+        return single, ((single & RANK_3) >> 8) & empty
+    single = (pawns << 8) & empty
+    return single, ((single & RANK_6) << 8) & empty
+
+
+def _build_line_tables() -> tuple[tuple[tuple[int, ...], ...], ...]:
+    """Builds the BETWEEN and LINE tables for every pair of aligned squares."""
+    between = [[0] * 64 for _ in range(64)]
+    line = [[0] * 64 for _ in range(64)]
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        for row_step, col_step in ROOK_DIRECTIONS + BISHOP_DIRECTIONS:
+            # Full line through sq in this direction and its opposite
+            full = ray_attacks(sq, 0, ((row_step, col_step), (-row_step, -col_step)))
+            full |= 1 << sq
+            path = 0
+            to_row = row + row_step
+            to_col = col + col_step
+            while 0 <= to_row < 8 and 0 <= to_col < 8:
+                to_sq = to_row * 8 + to_col
+                between[sq][to_sq] = path
+                line[sq][to_sq] = full
+                path |= 1 << to_sq
+                to_row += row_step
+                to_col += col_step
+    return (
+        tuple(tuple(row) for row in between),
+        tuple(tuple(row) for row in line),
+    )
+
+
+# BETWEEN[a][b]: squares strictly between two aligned squares (0 if not aligned)
+# LINE[a][b]: the whole rank, file or diagonal through both (0 if not aligned)
+BETWEEN, LINE = _build_line_tables()
@@ -0,0 +1,288 @@
+"""Bitboard board representation.
+
+Squares are indexed as ``row * 8 + col`` with row 0 being rank 8, matching the
+``list[list[Piece]]`` grid layout used by the UI. Each of the twelve
+piece-type/color combinations is stored as one 64-bit integer.
+"""
+
+import dataclasses
+from collections.abc import Iterator
+
+from .pieces import (
+    KING,
+    PIECE_TYPES,
+    PIECES,
+    PLAYERS,
+    Piece,
+    PieceType,
+    PlayerType,
+    NO_PIECE,
+)
+from .zobrist import ZOBRIST
+
+BB_ALL = (1 << 64) - 1
+FILE_A = 0x0101010101010101
+FILE_H = FILE_A << 7
+# Ranks a single pawn push lands on before a double push is possible
+RANK_3 = 0xFF << 40
+RANK_6 = 0xFF << 16
+# Last ranks of both colors, where pawns promote
+RANK_8 = 0xFF
+RANK_1 = 0xFF << 56
+
+# Bitboard field name for each (piece type, owner) combination
+_FIELD_BY_PIECE = {
+    (PieceType.PAWN, PlayerType.WHITE): "WP",
+    (PieceType.KNIGHT, PlayerType.WHITE): "WN",
+    (PieceType.BISHOP, PlayerType.WHITE): "WB",
+    (PieceType.ROOK, PlayerType.WHITE): "WR",
+    (PieceType.QUEEN, PlayerType.WHITE): "WQ",
+    (PieceType.KING, PlayerType.WHITE): "WK",
+    (PieceType.PAWN, PlayerType.BLACK): "BP",
+    (PieceType.KNIGHT, PlayerType.BLACK): "BN",
+    (PieceType.BISHOP, PlayerType.BLACK): "BB",
+    (PieceType.ROOK, PlayerType.BLACK): "BR",
+    (PieceType.QUEEN, PlayerType.BLACK): "BQ",
+    (PieceType.KING, PlayerType.BLACK): "BK",
+}
+_FIELDS = tuple(_FIELD_BY_PIECE.values())
+
+# Mailbox bytes encode a piece as (owner << 3) | type, 0 for an empty square
+
+# Shared Piece instances indexed by mailbox byte
+_PIECE_BY_CODE = tuple(
+    (
+        PIECES[PIECE_TYPES[code & 7], PLAYERS[code >> 3]]
+        if 0 < code & 7 <= KING
+        else NO_PIECE
+    )
+    for code in range(16)
+)
+
+
+def mailbox_code(piece_type: PieceType, player: PlayerType) -> int:
+    """Returns the mailbox byte for the given piece."""
+    return (player.code << 3) | piece_type.code
+
+
+def mb_type(code: int) -> int:
+    """Returns the piece type bits of a mailbox byte."""
+    return code & 7
+
+
+def mb_owner(code: int) -> int:
+    """Returns the owner bit of a mailbox byte."""
+    return code >> 3
+
+
+def _field_index(code: int) -> int:
+    """Returns the index into _FIELDS (and ZOBRIST) of a non-empty mailbox byte."""
+    return (code >> 3) * 6 + (code & 7) - 1
+
+
+def iter_bits(bb: int) -> Iterator[int]:
+    """Yields the index of every set square in a bitboard, lowest first."""
+    while bb:
+        lsb = bb & -bb
+        yield lsb.bit_length() - 1
+        bb ^= lsb
+
+
+def square_index(row: int, col: int) -> int:
+    """Returns the square index for the given row and column."""
+    return row * 8 + col
+
+
+def square_bb(row: int, col: int) -> int:
+    """Returns a bitboard with only the given square set."""
+    return 1 << (row * 8 + col)
+
+
+@dataclasses.dataclass
+class BoardState:
+    """Board position stored as one bitboard per piece type and color."""
+
+    WP: int = 0
+    WN: int = 0
+    WB: int = 0
+    WR: int = 0
+    WQ: int = 0
+    WK: int = 0
+    BP: int = 0
+    BN: int = 0
+    BB: int = 0
+    BR: int = 0
+    BQ: int = 0
+    BK: int = 0
+    # Zobrist hash of the piece placement, kept up to date by the mutators
+    zobrist: int = dataclasses.field(default=0, compare=False)
+    # Piece on each square as a mailbox byte, rebuilt from the bitboards
+    mailbox: bytearray = dataclasses.field(init=False, repr=False, compare=False)
+    # King square of each player indexed by owner code, -1 without a king
+    king_sq: list[int] = dataclasses.field(init=False, repr=False, compare=False)
+    # Squares occupied by each side, kept up to date by the mutators
+    white_occ: int = dataclasses.field(init=False, repr=False, compare=False)
+    black_occ: int = dataclasses.field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.zobrist:
+            self.zobrist = self.compute_zobrist()
+        self.mailbox = bytearray(64)
+        for index, field in enumerate(_FIELDS):
+            code = ((index // 6) << 3) | (index % 6 + 1)
+            for sq in iter_bits(getattr(self, field)):
+                self.mailbox[sq] = code
+        self.king_sq = [self.WK.bit_length() - 1, self.BK.bit_length() - 1]
+        self.white_occ = self.WP | self.WN | self.WB | self.WR | self.WQ | self.WK
+        self.black_occ = self.BP | self.BN | self.BB | self.BR | self.BQ | self.BK
+
+    def copy(self) -> "BoardState":
+        """Returns an independent copy without rescanning the bitboards."""
+        state = object.__new__(BoardState)
+        state.__dict__.update(self.__dict__)
+        state.mailbox = self.mailbox[:]
+        state.king_sq = self.king_sq[:]
+        return state
+
+    def compute_zobrist(self) -> int:
+        """Computes the Zobrist hash of the piece placement from scratch."""
+        key = 0
+        for index, field in enumerate(_FIELDS):
+            keys = ZOBRIST[index]
+            for sq in iter_bits(getattr(self, field)):
+                key ^= keys[sq]
+        return key
+
+    @property
+    def occ(self) -> int:
+        """Squares occupied by any piece."""
+        return self.white_occ | self.black_occ
+
+    def occupancy(self, player: PlayerType) -> int:
+        """Squares occupied by the given player's pieces."""
+        return self.white_occ if player == PlayerType.WHITE else self.black_occ
+
+    def pieces(self, piece_type: PieceType, player: PlayerType) -> int:
+        """Bitboard of the given player's pieces of the given type."""
+        return getattr(self, _FIELD_BY_PIECE[piece_type, player])
+
+    def side(self, player: PlayerType) -> tuple[int, int, int, int, int, int]:
+        """Returns the player's (pawns, knights, bishops, rooks, queens, king)."""
+        if player == PlayerType.WHITE:
+            return self.WP, self.WN, self.WB, self.WR, self.WQ, self.WK
+        return self.BP, self.BN, self.BB, self.BR, self.BQ, self.BK
+
+    def piece_at(self, sq: int) -> Piece:
+        """Returns the piece on the given square, or NO_PIECE if empty."""
+        return _PIECE_BY_CODE[self.mailbox[sq]]
+
+    def move_piece(self, from_sq: int, to_sq: int) -> None:
+        """Moves the piece on from_sq to to_sq, removing any piece on to_sq."""
+        mailbox = self.mailbox
+        if mailbox[to_sq]:
+            self.clear_square(to_sq)
+        code = mailbox[from_sq]
+        if not code:
+            return
+
+        index = _field_index(code)
+        field = _FIELDS[index]
+        move_bits = 1 << from_sq | 1 << to_sq
+        setattr(self, field, getattr(self, field) ^ move_bits)
+        if code >> 3:
+            self.black_occ ^= move_bits
+        else:
+            self.white_occ ^= move_bits
+        self.zobrist ^= ZOBRIST[index][from_sq] ^ ZOBRIST[index][to_sq]
+        mailbox[from_sq] = 0
+        mailbox[to_sq] = code
+        if code & 7 == KING:
+            self.king_sq[code >> 3] = to_sq
+
+    def make_move(self, from_sq: int, to_sq: int) -> tuple[int, int, int, int]:
+        """Moves a piece like move_piece and returns the record to unmake it."""
+        undo = (from_sq, to_sq, self.mailbox[to_sq], self.zobrist)
+        self.move_piece(from_sq, to_sq)
+        return undo
+
+    def unmake_move(self, undo: tuple[int, int, int, int]) -> None:
+        """Takes back a move made with make_move, restoring any captured piece."""
+        from_sq, to_sq, captured, zobrist = undo
+        self.move_piece(to_sq, from_sq)
+        if captured:
+            self._put_code(to_sq, captured)
+        self.zobrist = zobrist
+
+    def clear_square(self, sq: int) -> None:
+        """Removes whatever piece stands on the given square."""
+        code = self.mailbox[sq]
+        if not code:
+            return
+
+        index = _field_index(code)
+        field = _FIELDS[index]
+        bit = 1 << sq
+        setattr(self, field, getattr(self, field) ^ bit)
+        if code >> 3:
+            self.black_occ ^= bit
+        else:
+            self.white_occ ^= bit
+        self.zobrist ^= ZOBRIST[index][sq]
+        self.mailbox[sq] = 0
+        if code & 7 == KING:
+            self.king_sq[code >> 3] = -1
+
+    def put_piece(self, sq: int, piece_type: PieceType, player: PlayerType) -> None:
+        """Places a piece on the given square, replacing any piece already there."""
+        self.clear_square(sq)
+        self._put_code(sq, mailbox_code(piece_type, player))
+
+    def _put_code(self, sq: int, code: int) -> None:
+        """Places the piece with the given mailbox byte on an empty square."""
+        index = _field_index(code)
+        field = _FIELDS[index]
+        bit = 1 << sq
+        setattr(self, field, getattr(self, field) | bit)
+        if code >> 3:
+            self.black_occ |= bit
+        else:
+            self.white_occ |= bit
+        self.zobrist ^= ZOBRIST[index][sq]
+        self.mailbox[sq] = code
+        if code & 7 == KING:
+            self.king_sq[code >> 3] = sq
+
+    @classmethod
+    def from_grid(cls, grid: list[list[Piece]]) -> "BoardState":
+        """Builds a bitboard position from a list-of-lists grid."""
+        fields = _FIELDS
+        boards = dict.fromkeys(fields, 0)
+        for row in range(8):
+            grid_row = grid[row]
+            for col in range(8):
+                piece = grid_row[col]
+                if piece is NO_PIECE:
+                    continue
+                type_code = piece.type.code
+                if not type_code:
+                    continue
+                field = fields[piece.owner.code * 6 + type_code - 1]
+                boards[field] |= 1 << (row * 8 + col)
+        return cls(**boards)
+
+    @classmethod
+    def from_bytes(cls, codes: bytes) -> "BoardState":
+        """Builds a bitboard position from 64 mailbox bytes."""
+        boards = dict.fromkeys(_FIELDS, 0)
+        for sq, code in enumerate(codes):
+            if code:
+                boards[_FIELDS[_field_index(code)]] |= 1 << sq
+        return cls(**boards)
+
+    def to_bytes(self) -> bytes:
+        """Returns the 64 mailbox bytes, one ``(owner << 3) | type`` per square."""
+        return bytes(self.mailbox)
+
+    def to_grid(self) -> list[list[Piece]]:
+        """Builds the list-of-lists grid view used for rendering."""
+        return [[self.piece_at(row * 8 + col) for col in range(8)] for row in range(8)]
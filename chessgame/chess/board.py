@@ -1,30 +1,31 @@
 """Chess board state and operations."""
 
-from .pieces import Piece, PieceType, PlayerType, NO_PIECE
+from .bitboard import BoardState
+from .pieces import PIECES, Piece, PieceType, PlayerType, NO_PIECE
 
 
 def create_default_board() -> list[list[Piece]]:
     """Creates the default chess starting position."""
     return [
         [
-            Piece(PieceType.ROOK, PlayerType.BLACK),
-            Piece(PieceType.KNIGHT, PlayerType.BLACK),
-            Piece(PieceType.BISHOP, PlayerType.BLACK),
-            Piece(PieceType.QUEEN, PlayerType.BLACK),
-            Piece(PieceType.KING, PlayerType.BLACK),
-            Piece(PieceType.BISHOP, PlayerType.BLACK),
-            Piece(PieceType.KNIGHT, PlayerType.BLACK),
-            Piece(PieceType.ROOK, PlayerType.BLACK),
+            PIECES[PieceType.ROOK, PlayerType.BLACK],
+            PIECES[PieceType.KNIGHT, PlayerType.BLACK],
+            PIECES[PieceType.BISHOP, PlayerType.BLACK],
+            PIECES[PieceType.QUEEN, PlayerType.BLACK],
+            PIECES[PieceType.KING, PlayerType.BLACK],
+            PIECES[PieceType.BISHOP, PlayerType.BLACK],
+            PIECES[PieceType.KNIGHT, PlayerType.BLACK],
+            PIECES[PieceType.ROOK, PlayerType.BLACK],
         ],
         [
-            Piece(PieceType.PAWN, PlayerType.BLACK),
-            Piece(PieceType.PAWN, PlayerType.BLACK),
-            Piece(PieceType.PAWN, PlayerType.BLACK),
-            Piece(PieceType.PAWN, PlayerType.BLACK),
-            Piece(PieceType.PAWN, PlayerType.BLACK),
-            Piece(PieceType.PAWN, PlayerType.BLACK),
-            Piece(PieceType.PAWN, PlayerType.BLACK),
-            Piece(PieceType.PAWN, PlayerType.BLACK),
+            PIECES[PieceType.PAWN, PlayerType.BLACK],
+            PIECES[PieceType.PAWN, PlayerType.BLACK],
+            PIECES[PieceType.PAWN, PlayerType.BLACK],
+            PIECES[PieceType.PAWN, PlayerType.BLACK],
+            PIECES[PieceType.PAWN, PlayerType.BLACK],
+            PIECES[PieceType.PAWN, PlayerType.BLACK],
+            PIECES[PieceType.PAWN, PlayerType.BLACK],
+            PIECES[PieceType.PAWN, PlayerType.BLACK],
         ],
         [
             NO_PIECE,
@@ -67,38 +68,55 @@ def create_default_board() -> list[list[Piece]]:
             NO_PIECE,
         ],
         [
-            Piece(PieceType.PAWN, PlayerType.WHITE),
-            Piece(PieceType.PAWN, PlayerType.WHITE),
-            Piece(PieceType.PAWN, PlayerType.WHITE),
-            Piece(PieceType.PAWN, PlayerType.WHITE),
-            Piece(PieceType.PAWN, PlayerType.WHITE),
-            Piece(PieceType.PAWN, PlayerType.WHITE),
-            Piece(PieceType.PAWN, PlayerType.WHITE),
-            Piece(PieceType.PAWN, PlayerType.WHITE),
+            PIECES[PieceType.PAWN, PlayerType.WHITE],
+            PIECES[PieceType.PAWN, PlayerType.WHITE],
+            PIECES[PieceType.PAWN, PlayerType.WHITE],
+            PIECES[PieceType.PAWN, PlayerType.WHITE],
+            PIECES[PieceType.PAWN, PlayerType.WHITE],
+            PIECES[PieceType.PAWN, PlayerType.WHITE],
+            PIECES[PieceType.PAWN, PlayerType.WHITE],
+            PIECES[PieceType.PAWN, PlayerType.WHITE],
         ],
         [
-            Piece(PieceType.ROOK, PlayerType.WHITE),
-            Piece(PieceType.KNIGHT, PlayerType.WHITE),
-            Piece(PieceType.BISHOP, PlayerType.WHITE),
-            Piece(PieceType.QUEEN, PlayerType.WHITE),
-            Piece(PieceType.KING, PlayerType.WHITE),
-            Piece(PieceType.BISHOP, PlayerType.WHITE),
-            Piece(PieceType.KNIGHT, PlayerType.WHITE),
-            Piece(PieceType.ROOK, PlayerType.WHITE),
+            PIECES[PieceType.ROOK, PlayerType.WHITE],
+            PIECES[PieceType.KNIGHT, PlayerType.WHITE],
+            PIECES[PieceType.BISHOP, PlayerType.WHITE],
+            PIECES[PieceType.QUEEN, PlayerType.WHITE],
+            PIECES[PieceType.KING, PlayerType.WHITE],
+            PIECES[PieceType.BISHOP, PlayerType.WHITE],
+            PIECES[PieceType.KNIGHT, PlayerType.WHITE],
+            PIECES[PieceType.ROOK, PlayerType.WHITE],
         ],
     ]
 
 
-def find_king(grid: list[list[Piece]], player: PlayerType) -> tuple[int, int] | None:
+def create_default_state() -> BoardState:
+    """Creates the default chess starting position as bitboards."""
+    return BoardState.from_grid(create_default_board())
+
+
+def find_king(
+    grid: list[list[Piece]] | BoardState, player: PlayerType
+) -> tuple[int, int] | None:
     """Find the position of the king for the given player."""
+    if isinstance(grid, BoardState):
+        king_sq = grid.king_sq[player.code]
+        if king_sq < 0:
+            return None
+        return divmod(king_sq, 8)
+
     for row in range(8):
         for col in range(8):
             piece = grid[row][col]
-            if piece.type == PieceType.KING and piece.owner == player:
+            if piece.type is PieceType.KING and piece.owner is player:
                 return (row, col)
     return None
 
 
-def copy_board(grid: list[list[Piece]]) -> list[list[Piece]]:
+def copy_board(
+    grid: list[list[Piece]] | BoardState,
+) -> list[list[Piece]] | BoardState:
     """Create a deep copy of the board."""
+    if isinstance(grid, BoardState):
+        return grid.copy()
     return [row.copy() for row in grid]
@@ -1,30 +1,151 @@
 """Chess game engine with move validation and game logic."""
 
-from .pieces import Piece, PieceType, PlayerType, NO_PIECE
-from .board import find_king
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterator
+
+from .attacks import (
+    BETWEEN,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    LINE,
+    PAWN_ATTACKS,
+    pawn_pushes,
+)
+from .bitboard import (
+    BB_ALL,
+    FILE_A,
+    FILE_H,
+    RANK_1,
+    RANK_8,
+    BoardState,
+    iter_bits,
+    mb_owner,
+    mb_type,
+    square_bb,
+)
+from .magic import bishop_attacks, rook_attacks
+from .pieces import PAWN, PLAYERS, Piece, PieceType, PlayerType
+from .zobrist import ZOBRIST_BLACK_TO_MOVE, ZOBRIST_CASTLING, ZOBRIST_EP_FILE
 
 COL_NOTATION = "abcdefgh"
 
+# Algebraic name of each square index, e.g. SQUARE_NAME[52] == "e2"
+SQUARE_NAME = tuple(f"{COL_NOTATION[sq % 8]}{8 - sq // 8}" for sq in range(64))
+
+# (row, col) of each square index
+_SQUARE_COORDS = tuple(divmod(sq, 8) for sq in range(64))
+
+# Piece symbols indexed by piece type code (empty string for pawns)
+PIECE_SYMBOL = ("", "", "N", "B", "R", "Q", "K")
+
+# Pawn forward step, starting row and promotion row, indexed by owner code
+_PAWN_DIR = (-1, 1)
+_PAWN_START = (6, 1)
+_PAWN_PROMO = (0, 7)
+
+# Piece values for MVV-LVA move ordering, indexed by piece type code
+_ORDER_VALUES = (0, 1, 3, 3, 5, 9, 10)
+
+Board = list[list[Piece]] | BoardState
+# En passant target as given by callers: a square index (-1 for none), or the
+# (row, col) tuple / None form stored by the UI
+EnPassantTarget = int | tuple[int, int] | None
+
+# LRU cache of is_in_check results keyed by (zobrist hash, player)
+_CHECK_CACHE_SIZE = 1 << 16
+_check_cache: OrderedDict[tuple[int, PlayerType], bool] = OrderedDict()
+
+# Squares between king and rook that must be empty, indexed by owner code
+KINGSIDE_PATH = (0x60 << 56, 0x60)  # f1 g1, f8 g8
+QUEENSIDE_PATH = (0x0E << 56, 0x0E)  # b1 c1 d1, b8 c8 d8
+# Squares the king starts on, crosses and lands on, none of which may be attacked
+KINGSIDE_KING_PATH = ((60, 61, 62), (4, 5, 6))
+QUEENSIDE_KING_PATH = ((60, 59, 58), (4, 3, 2))
+
+# Castling rights packed into one int, KQkq from the low bit up
+CASTLE_WHITE_KINGSIDE = 1
+CASTLE_WHITE_QUEENSIDE = 2
+CASTLE_BLACK_KINGSIDE = 4
+CASTLE_BLACK_QUEENSIDE = 8
+CASTLE_ALL = 0b1111
+# Rights kept after a move from or to each square: moving a king or rook off
+# its home square, or capturing a rook on it, clears the matching rights
+_CASTLE_LOST = {
+    60: CASTLE_WHITE_KINGSIDE | CASTLE_WHITE_QUEENSIDE,  # e1
+    63: CASTLE_WHITE_KINGSIDE,  # h1
+    56: CASTLE_WHITE_QUEENSIDE,  # a1
+    4: CASTLE_BLACK_KINGSIDE | CASTLE_BLACK_QUEENSIDE,  # e8
+    7: CASTLE_BLACK_KINGSIDE,  # h8
+    0: CASTLE_BLACK_QUEENSIDE,  # a8
+}
+CASTLE_CLEAR = tuple(CASTLE_ALL & ~_CASTLE_LOST.get(sq, 0) for sq in range(64))
+
+# LRU cache of packed legal move lists keyed by (zobrist hash, player code,
+# en passant square); castling is not generated so rights are not part of it
+_MOVES_CACHE_SIZE = 1 << 14
+_moves_cache: OrderedDict[tuple[int, int, int], tuple[int, ...]] = OrderedDict()
+
+# LRU cache of has_any_legal_move results, keyed like _moves_cache
+_HAS_MOVE_CACHE_SIZE = 1 << 14
+_has_move_cache: OrderedDict[tuple[int, int, int], bool] = OrderedDict()
+
+
+def _as_state(grid: Board) -> BoardState:
+    """Returns the bitboard position for a grid (or the position itself)."""
+    if isinstance(grid, BoardState):
+        return grid
+    return BoardState.from_grid(grid)
+
+
+def _ep_square(en_passant_target: EnPassantTarget) -> int:
+    """Returns the en passant target as a square index, -1 if there is none."""
+    if en_passant_target is None:
+        return -1
+    if isinstance(en_passant_target, int):
+        return en_passant_target
+    return en_passant_target[0] * 8 + en_passant_target[1]
+
+
+# Move flag set on packed pawn moves that reach the last rank
+MOVE_PROMOTION = 1
+
+
+def encode_move(from_sq: int, to_sq: int, flags: int = 0) -> int:
+    """Packs a move into one int: from in bits 0-5, to in 6-11, flags above."""
+    return from_sq | (to_sq << 6) | (flags << 12)
+
+
+def decode_move(move: int) -> tuple[int, int, int, int]:
+    """Unpacks a move into the (from_row, from_col, to_row, to_col) tuple."""
+    return _SQUARE_COORDS[move & 63] + _SQUARE_COORDS[(move >> 6) & 63]
+
 
 class ChessEngine:
-    """Chess game engine for move validation and game logic."""
+    """Chess game engine for move validation and game logic.
+
+    Every method taking a board accepts either the ``list[list[Piece]]`` grid
+    used by the UI or a ``BoardState``; grids are converted to bitboards once
+    per call.
+    """
 
     @staticmethod
     def is_valid_move(
-        grid: list[list[Piece]],
+        grid: Board,
         from_row: int,
         from_col: int,
         to_row: int,
         to_col: int,
-        en_passant_target: tuple[int, int] | None = None,
+        en_passant_target: EnPassantTarget = None,
     ) -> bool:
         """Validates if a move is legal according to chess rules."""
         # Bounds check
         if not (0 <= to_row < 8 and 0 <= to_col < 8):
             return False
 
-        piece = grid[from_row][from_col]
-        if piece.type == PieceType.NONE:
+        state = _as_state(grid)
+        code = state.mailbox[from_row * 8 + from_col]
+        if not code:
             return False
 
         # Can't move to same square
@@ -32,202 +153,283 @@ class ChessEngine:
             return False
 
         # Can't move to square occupied by own piece
-        destination_piece = grid[to_row][to_col]
-        if (
-            destination_piece.type != PieceType.NONE
-            and destination_piece.owner == piece.owner
-        ):
+        owner = PLAYERS[mb_owner(code)]
+        if state.occupancy(owner) & square_bb(to_row, to_col):
             return False
 
-        # Piece-specific validation
-        if piece.type == PieceType.PAWN:
-            return ChessEngine._is_valid_pawn_move(
-                grid, from_row, from_col, to_row, to_col, piece.owner, en_passant_target
-            )
-        elif piece.type == PieceType.ROOK:
-            return ChessEngine._is_valid_rook_move(
-                grid, from_row, from_col, to_row, to_col
-            )
-        elif piece.type == PieceType.BISHOP:
-            return ChessEngine._is_valid_bishop_move(
-                grid, from_row, from_col, to_row, to_col
-            )
-        elif piece.type == PieceType.KNIGHT:
-            return ChessEngine._is_valid_knight_move(
-                grid, from_row, from_col, to_row, to_col
-            )
-        elif piece.type == PieceType.QUEEN:
-            return ChessEngine._is_valid_queen_move(
-                grid, from_row, from_col, to_row, to_col
-            )
-        elif piece.type == PieceType.KING:
-            # Check for castling first
-            if ChessEngine.is_castling_move(grid, from_row, from_col, to_row, to_col):
-                # Castling validation will be handled separately in the UI layer
-                return True
-            else:
-                return ChessEngine._is_valid_king_move(
-                    grid, from_row, from_col, to_row, to_col
-                )
-
-        return False
+        # Piece-specific validation, looked up by the mailbox type bits
+        validator = _VALIDATORS[mb_type(code)]
+        return validator(
+            state,
+            from_row,
+            from_col,
+            to_row,
+            to_col,
+            owner,
+            _ep_square(en_passant_target),
+        )
 
     @staticmethod
     def _is_valid_pawn_move(
-        grid: list[list[Piece]],
+        state: BoardState,
         from_row: int,
         from_col: int,
         to_row: int,
         to_col: int,
         owner: PlayerType,
-        en_passant_target: tuple[int, int] | None = None,
+        ep_sq: int = -1,
     ) -> bool:
         """Validates pawn moves."""
-        direction = (
-            -1 if owner == PlayerType.WHITE else 1
-        )  # White moves up (negative), Black moves down (positive)
-        start_row = 6 if owner == PlayerType.WHITE else 1
-
-        # Forward moves
-        if from_col == to_col:
-            # One square forward
-            if to_row == from_row + direction:
-                return grid[to_row][to_col].type == PieceType.NONE
-            # Two squares forward from starting position
-            elif from_row == start_row and to_row == from_row + 2 * direction:
-                return (
-                    grid[to_row][to_col].type == PieceType.NONE
-                    and grid[from_row + direction][to_col].type == PieceType.NONE
-                )
-
-        # Diagonal captures
-        elif abs(from_col - to_col) == 1 and to_row == from_row + direction:
-            target_piece = grid[to_row][to_col]
-
-            # Regular diagonal capture
-            if target_piece.type != PieceType.NONE and target_piece.owner != owner:
-                return True
-
-            # En passant capture
-            if (
-                en_passant_target is not None
-                and (to_row, to_col) == en_passant_target
-                and target_piece.type == PieceType.NONE
-            ):
-                return True
-
+        from_sq = from_row * 8 + from_col
+        to_sq = to_row * 8 + to_col
+        occ = state.occ
+
+        # Diagonal captures come from the attack table, en passant included
+        if PAWN_ATTACKS[owner.code][from_sq] >> to_sq & 1:
+            enemy = state.white_occ if owner.code else state.black_occ
+            return bool(enemy >> to_sq & 1) or (to_sq == ep_sq and not occ >> to_sq & 1)
+
+        # Pushes need empty squares, and a double push a pawn on its start rank
+        step = _PAWN_DIR[owner.code] * 8
+        if to_sq == from_sq + step:
+            return not occ >> to_sq & 1
+        if to_sq == from_sq + 2 * step and from_row == _PAWN_START[owner.code]:
+            return not (occ >> (from_sq + step) & 1 or occ >> to_sq & 1)
         return False
 
     @staticmethod
     def _is_valid_rook_move(
-        grid: list[list[Piece]], from_row: int, from_col: int, to_row: int, to_col: int
+        state: BoardState,
+        from_row: int,
+        from_col: int,
+        to_row: int,
+        to_col: int,
+        owner: PlayerType | None = None,
+        ep_sq: int = -1,
     ) -> bool:
         """Validates rook moves (horizontal/vertical)."""
-        # Must move in straight line
-        if from_row != to_row and from_col != to_col:
-            return False
-
-        return ChessEngine._is_path_clear(grid, from_row, from_col, to_row, to_col)
+        attacks = rook_attacks(from_row * 8 + from_col, state.occ)
+        return bool(attacks & square_bb(to_row, to_col))
 
     @staticmethod
     def _is_valid_bishop_move(
-        grid: list[list[Piece]], from_row: int, from_col: int, to_row: int, to_col: int
+        state: BoardState,
+        from_row: int,
+        from_col: int,
+        to_row: int,
+        to_col: int,
+        owner: PlayerType | None = None,
+        ep_sq: int = -1,
     ) -> bool:
         """Validates bishop moves (diagonal)."""
-        # Must move diagonally
-        if abs(from_row - to_row) != abs(from_col - to_col):
-            return False
-
-        return ChessEngine._is_path_clear(grid, from_row, from_col, to_row, to_col)
+        attacks = bishop_attacks(from_row * 8 + from_col, state.occ)
+        return bool(attacks & square_bb(to_row, to_col))
 
     @staticmethod
     def _is_valid_knight_move(
-        grid: list[list[Piece]], from_row: int, from_col: int, to_row: int, to_col: int
+        state: BoardState,
+        from_row: int,
+        from_col: int,
+        to_row: int,
+        to_col: int,
+        owner: PlayerType | None = None,
+        ep_sq: int = -1,
     ) -> bool:
         """Validates knight moves (L-shape)."""
-        row_diff = abs(from_row - to_row)
-        col_diff = abs(from_col - to_col)
-
-        # L-shape: 2+1 or 1+2
-        return (row_diff == 2 and col_diff == 1) or (row_diff == 1 and col_diff == 2)
+        return bool(KNIGHT_ATTACKS[from_row * 8 + from_col] & square_bb(to_row, to_col))
 
     @staticmethod
     def _is_valid_queen_move(
-        grid: list[list[Piece]], from_row: int, from_col: int, to_row: int, to_col: int
+        state: BoardState,
+        from_row: int,
+        from_col: int,
+        to_row: int,
+        to_col: int,
+        owner: PlayerType | None = None,
+        ep_sq: int = -1,
     ) -> bool:
         """Validates queen moves (combination of rook and bishop)."""
-        return ChessEngine._is_valid_rook_move(
-            grid, from_row, from_col, to_row, to_col
-        ) or ChessEngine._is_valid_bishop_move(grid, from_row, from_col, to_row, to_col)
+        from_sq = from_row * 8 + from_col
+        occ = state.occ
+        attacks = rook_attacks(from_sq, occ) | bishop_attacks(from_sq, occ)
+        return bool(attacks & square_bb(to_row, to_col))
 
     @staticmethod
     def _is_valid_king_move(
-        grid: list[list[Piece]], from_row: int, from_col: int, to_row: int, to_col: int
+        state: BoardState,
+        from_row: int,
+        from_col: int,
+        to_row: int,
+        to_col: int,
+        owner: PlayerType | None = None,
+        ep_sq: int = -1,
     ) -> bool:
-        """Validates king moves (one square in any direction)."""
-        row_diff = abs(from_row - to_row)
-        col_diff = abs(from_col - to_col)
+        """Validates king moves (one square in any direction, or castling)."""
+        if ChessEngine.is_castling_move(state, from_row, from_col, to_row, to_col):
+            # Castling validation will be handled separately in the UI layer
+            return True
+        return bool(KING_ATTACKS[from_row * 8 + from_col] & square_bb(to_row, to_col))
 
-        # One square in any direction
-        return row_diff <= 1 and col_diff <= 1
+    @staticmethod
+    def attackers_to(
+        state: BoardState, sq: int, by_player: PlayerType, occ: int | None = None
+    ) -> int:
+        """Bitboard of the given player's pieces attacking sq.
+
+        ``occ`` overrides the occupancy used for slider rays, e.g. to look
+        through a king that is about to move.
+        """
+        if occ is None:
+            occ = state.occ
+        pawns, knights, bishops, rooks, queens, king = state.side(by_player)
+        # Pawns attacking sq stand where a defending pawn on sq would attack
+        return (
+            (PAWN_ATTACKS[by_player.code ^ 1][sq] & pawns)
+            | (KNIGHT_ATTACKS[sq] & knights)
+            | (KING_ATTACKS[sq] & king)
+            | (bishop_attacks(sq, occ) & (bishops | queens))
+            | (rook_attacks(sq, occ) & (rooks | queens))
+        )
 
     @staticmethod
-    def _is_path_clear(
-        grid: list[list[Piece]], from_row: int, from_col: int, to_row: int, to_col: int
-    ) -> bool:
-        """Checks if path between two squares is clear (excluding endpoints)."""
-        row_step = 0 if from_row == to_row else (1 if to_row > from_row else -1)
-        col_step = 0 if from_col == to_col else (1 if to_col > from_col else -1)
+    def _is_attacked_by(state: BoardState, sq: int, by_player: PlayerType) -> bool:
+        """Whether any of by_player's pieces attacks sq.
+
+        Tests the cheapest lookups first and returns on the first hit. The
+        enemy king is still tested because callers probe positions where the
+        kings may touch, e.g. each step of a castling king.
+        """
+        pawns, knights, bishops, rooks, queens, king = state.side(by_player)
+        if PAWN_ATTACKS[by_player.code ^ 1][sq] & pawns:
+            return True
+        if KNIGHT_ATTACKS[sq] & knights or KING_ATTACKS[sq] & king:
+            return True
+        occ = state.occ
+        if bishop_attacks(sq, occ) & (bishops | queens):
+            return True
+        return bool(rook_attacks(sq, occ) & (rooks | queens))
+
+    @staticmethod
+    def pins_and_checkers(state: BoardState, player: PlayerType) -> tuple[int, int]:
+        """Returns (pinned, checkers) bitboards for the given player's king.
+
+        ``pinned`` holds the player's pieces that are the only blocker between
+        their king and an enemy slider; ``checkers`` holds the enemy pieces
+        currently giving check.
+        """
+        king_sq = state.king_sq[player.code]
+        if king_sq < 0:
+            return 0, 0
+
+        enemy = PlayerType.BLACK if player == PlayerType.WHITE else PlayerType.WHITE
+        occ = state.occ
+        own = state.occupancy(player)
+        checkers = ChessEngine.attackers_to(state, king_sq, enemy, occ)
+
+        # Enemy sliders that would see the king on an empty board
+        _, _, bishops, rooks, queens, _ = state.side(enemy)
+        snipers = (rook_attacks(king_sq, 0) & (rooks | queens)) | (
+            bishop_attacks(king_sq, 0) & (bishops | queens)
+        )
 
-        current_row = from_row + row_step
-        current_col = from_col + col_step
+        pinned = 0
+        for sniper_sq in iter_bits(snipers):
+            blockers = BETWEEN[king_sq][sniper_sq] & occ
+            # Exactly one blocker, and it is ours
+            if blockers & own and not blockers & (blockers - 1):
+                pinned |= blockers
 
-        while current_row != to_row or current_col != to_col:
-            if grid[current_row][current_col].type != PieceType.NONE:
+        return pinned, checkers
+
+    @staticmethod
+    def _is_legal_move(
+        state: BoardState,
+        player: PlayerType,
+        from_sq: int,
+        to_sq: int,
+        king_sq: int,
+        pinned: int,
+        checkers: int,
+    ) -> bool:
+        """Checks that a pseudo-legal move does not leave the king in check."""
+        from_bit = 1 << from_sq
+        to_bit = 1 << to_sq
+        enemy = PlayerType.BLACK if player == PlayerType.WHITE else PlayerType.WHITE
+
+        # King moves: the destination must not be attacked once the king leaves
+        if from_sq == king_sq:
+            occ = state.occ ^ from_bit
+            return not ChessEngine.attackers_to(state, to_sq, enemy, occ)
+
+        # En passant can expose the king along the rank; test the occupancy
+        # after the capture and ignore the captured pawn as an attacker
+        if (
+            (state.WP | state.BP) & from_bit
+            and (from_sq ^ to_sq) & 7
+            and not state.occ & to_bit
+        ):
+            captured_bit = 1 << ((from_sq & ~7) | (to_sq & 7))
+            occ = state.occ ^ from_bit ^ to_bit ^ captured_bit
+            attackers = ChessEngine.attackers_to(state, king_sq, enemy, occ)
+            return not attackers & ~captured_bit
+
+        if checkers:
+            # Double check: only the king can move
+            if checkers & (checkers - 1):
+                return False
+            # Single check: capture the checker or block its ray
+            checker_sq = checkers.bit_length() - 1
+            if not to_bit & (checkers | BETWEEN[king_sq][checker_sq]):
                 return False
-            current_row += row_step
-            current_col += col_step
+
+        # Pinned pieces may only move along the pin line
+        if pinned & from_bit:
+            return bool(LINE[king_sq][from_sq] & to_bit)
 
         return True
 
     @staticmethod
     def is_square_under_attack(
-        grid: list[list[Piece]], row: int, col: int, by_player: PlayerType
+        grid: Board, row: int, col: int, by_player: PlayerType
     ) -> bool:
         """Check if a square is under attack by any piece of the given player."""
-        for attack_row in range(8):
-            for attack_col in range(8):
-                piece = grid[attack_row][attack_col]
-
-                # Skip empty squares and pieces not owned by the attacking player
-                if piece.type == PieceType.NONE or piece.owner != by_player:
-                    continue
-
-                # Check if this piece can attack the target square
-                if ChessEngine.is_valid_move(grid, attack_row, attack_col, row, col):
-                    return True
-
-        return False
+        state = _as_state(grid)
+        # Look outwards from the square instead of generating every attack
+        return ChessEngine._is_attacked_by(state, row * 8 + col, by_player)
 
     @staticmethod
-    def is_in_check(grid: list[list[Piece]], player: PlayerType) -> bool:
-        """Check if the given player's king is in check."""
-        king_pos = find_king(grid, player)
-        if king_pos is None:
+    def is_in_check(
+        grid: Board, player: PlayerType, king_sq: int | None = None
+    ) -> bool:
+        """Check if the given player's king is in check.
+
+        Callers that already know the king square can pass it as ``king_sq``;
+        otherwise it is read from the position.
+        """
+        state = _as_state(grid)
+        key = (state.zobrist, player)
+        if key in _check_cache:
+            _check_cache.move_to_end(key)
+            return _check_cache[key]
+
+        if king_sq is None:
+            king_sq = state.king_sq[player.code]
+        if king_sq < 0:
             return False  # No king found (shouldn't happen in normal game)
 
-        king_row, king_col = king_pos
         enemy_player = (
             PlayerType.BLACK if player == PlayerType.WHITE else PlayerType.WHITE
         )
 
-        return ChessEngine.is_square_under_attack(
-            grid, king_row, king_col, enemy_player
-        )
+        in_check = ChessEngine._is_attacked_by(state, king_sq, enemy_player)
+        _check_cache[key] = in_check
+        if len(_check_cache) > _CHECK_CACHE_SIZE:
+            _check_cache.popitem(last=False)
+        return in_check
 
     @staticmethod
     def would_leave_king_in_check(
-        grid: list[list[Piece]],
+        grid: Board,
         from_row: int,
         from_col: int,
         to_row: int,
@@ -235,30 +437,30 @@ class ChessEngine:
         player: PlayerType,
     ) -> bool:
         """Check if a move would leave the player's king in check."""
-        # Save the current state
-        original_piece = grid[from_row][from_col]
-        captured_piece = grid[to_row][to_col]
-
-        # Temporarily make the move
-        grid[to_row][to_col] = original_piece
-        grid[from_row][from_col] = NO_PIECE
-
-        # Check if king is in check after the move
-        king_in_check = ChessEngine.is_in_check(grid, player)
-
-        # Restore the original state
-        grid[from_row][from_col] = original_piece
-        grid[to_row][to_col] = captured_piece
+        state = _as_state(grid)
+        king_sq = state.king_sq[player.code]
+        if king_sq < 0:
+            return False  # No king found (shouldn't happen in normal game)
 
-        return king_in_check
+        pinned, checkers = ChessEngine.pins_and_checkers(state, player)
+        return not ChessEngine._is_legal_move(
+            state,
+            player,
+            from_row * 8 + from_col,
+            to_row * 8 + to_col,
+            king_sq,
+            pinned,
+            checkers,
+        )
 
     @staticmethod
     def is_castling_move(
-        grid: list[list[Piece]], from_row: int, from_col: int, to_row: int, to_col: int
+        grid: Board, from_row: int, from_col: int, to_row: int, to_col: int
     ) -> bool:
         """Check if this is a castling move (king moving 2 squares horizontally)."""
-        piece = grid[from_row][from_col]
-        if piece.type != PieceType.KING:
+        state = _as_state(grid)
+        king_bb = state.WK | state.BK
+        if not king_bb & square_bb(from_row, from_col):
             return False
 
         # King moving 2 squares horizontally on same row
@@ -266,7 +468,7 @@ class ChessEngine:
 
     @staticmethod
     def is_valid_castling(
-        grid: list[list[Piece]],
+        grid: Board,
         from_row: int,
         from_col: int,
         to_row: int,
@@ -277,10 +479,10 @@ class ChessEngine:
         queenside_rook_moved: bool,
     ) -> bool:
         """Validates castling moves."""
-        piece = grid[from_row][from_col]
+        state = _as_state(grid)
 
         # Must be a king
-        if piece.type != PieceType.KING or piece.owner != player:
+        if not state.pieces(PieceType.KING, player) & square_bb(from_row, from_col):
             return False
 
         # King must not have moved
@@ -300,69 +502,56 @@ class ChessEngine:
         if not is_kingside and queenside_rook_moved:
             return False
 
-        # Get rook position
-        rook_col = 7 if is_kingside else 0
-        rook = grid[from_row][rook_col]
+        if is_kingside:
+            path = KINGSIDE_PATH[player.code]
+            king_path = KINGSIDE_KING_PATH[player.code]
+            rook_col = 7
+        else:
+            path = QUEENSIDE_PATH[player.code]
+            king_path = QUEENSIDE_KING_PATH[player.code]
+            rook_col = 0
+
+        # King must stand on its starting square
+        if from_row * 8 + from_col != king_path[0]:
+            return False
 
         # Rook must be present and not moved
-        if rook.type != PieceType.ROOK or rook.owner != player:
+        if not state.pieces(PieceType.ROOK, player) & square_bb(from_row, rook_col):
             return False
 
         # Path between king and rook must be clear
-        start_col = min(from_col, rook_col) + 1
-        end_col = max(from_col, rook_col)
-        for col in range(start_col, end_col):
-            if grid[from_row][col].type != PieceType.NONE:
-                return False
-
-        # King must not be in check
-        if ChessEngine.is_in_check(grid, player):
+        if state.occ & path:
             return False
 
-        # King must not pass through or end in check
-        direction = 1 if is_kingside else -1
-        for i in range(1, 3):  # Check squares king passes through and lands on
-            test_col = from_col + (i * direction)
-
-            # Temporarily move king to test square
-            original_king = grid[from_row][from_col]
-            grid[from_row][from_col] = NO_PIECE
-            grid[from_row][test_col] = original_king
-
-            # Check if king would be in check
-            in_check = ChessEngine.is_in_check(grid, player)
-
-            # Restore original position
-            grid[from_row][from_col] = original_king
-            grid[from_row][test_col] = NO_PIECE
-
-            if in_check:
-                return False
-
-        return True
+        # King must not be in check, pass through check or end in check
+        enemy_player = (
+            PlayerType.BLACK if player == PlayerType.WHITE else PlayerType.WHITE
+        )
+        return not any(
+            ChessEngine._is_attacked_by(state, sq, enemy_player) for sq in king_path
+        )
 
     @staticmethod
     def is_en_passant_move(
-        grid: list[list[Piece]],
+        grid: Board,
         from_row: int,
         from_col: int,
         to_row: int,
         to_col: int,
-        en_passant_target: tuple[int, int] | None,
+        en_passant_target: EnPassantTarget,
     ) -> bool:
         """Check if this is an en passant capture."""
-        piece = grid[from_row][from_col]
+        state = _as_state(grid)
 
         # Must be a pawn
-        if piece.type != PieceType.PAWN:
+        if not (state.WP | state.BP) & square_bb(from_row, from_col):
             return False
 
         # Must be capturing diagonally to empty square
         if (
             abs(from_col - to_col) == 1
-            and grid[to_row][to_col].type == PieceType.NONE
-            and en_passant_target is not None
-            and (to_row, to_col) == en_passant_target
+            and not state.occ & square_bb(to_row, to_col)
+            and to_row * 8 + to_col == _ep_square(en_passant_target)
         ):
             return True
 
@@ -379,40 +568,29 @@ class ChessEngine:
     ) -> tuple[int, int] | None:
         """Get en passant target square if pawn moved 2 squares."""
         # Only pawns can create en passant targets
-        if piece_type != PieceType.PAWN:
+        if piece_type is not PieceType.PAWN:
             return None
 
-        # Must be moving 2 squares forward
-        if abs(from_row - to_row) != 2 or from_col != to_col:
+        # Must be moving 2 squares forward from the starting row
+        direction = _PAWN_DIR[owner.code]
+        if from_col != to_col or to_row - from_row != 2 * direction:
             return None
-
-        # Must be from starting position
-        if owner == PlayerType.WHITE and from_row != 6:
-            return None
-        if owner == PlayerType.BLACK and from_row != 1:
+        if from_row != _PAWN_START[owner.code]:
             return None
 
         # En passant target is the square the pawn "jumped over"
-        target_row = (from_row + to_row) // 2
-        return (target_row, from_col)
+        return (from_row + direction, from_col)
 
     @staticmethod
     def is_pawn_promotion(
         from_row: int, to_row: int, piece_type: PieceType, owner: PlayerType
     ) -> bool:
         """Check if a pawn move results in promotion."""
-        if piece_type != PieceType.PAWN:
+        if piece_type is not PieceType.PAWN:
             return False
 
-        # White pawns promote when reaching row 0 (rank 8)
-        if owner == PlayerType.WHITE and to_row == 0:
-            return True
-
-        # Black pawns promote when reaching row 7 (rank 1)
-        if owner == PlayerType.BLACK and to_row == 7:
-            return True
-
-        return False
+        # White pawns promote on row 0 (rank 8), black pawns on row 7 (rank 1)
+        return to_row == _PAWN_PROMO[owner.code]
 
     @staticmethod
     def get_chess_notation(
@@ -424,90 +602,345 @@ class ChessEngine:
         is_capture: bool,
     ) -> str:
         """Generates proper chess notation for a move."""
-        # Piece symbols (empty string for pawns)
-        piece_symbols = {
-            PieceType.KING: "K",
-            PieceType.QUEEN: "Q",
-            PieceType.ROOK: "R",
-            PieceType.BISHOP: "B",
-            PieceType.KNIGHT: "N",
-            PieceType.PAWN: "",
-        }
-
-        piece_symbol = piece_symbols.get(piece_type, "")
-        to_square = f"{COL_NOTATION[to_col]}{8 - to_row}"
-
-        # Basic notation
-        if piece_type == PieceType.PAWN:
+        to_square = SQUARE_NAME[to_row * 8 + to_col]
+
+        # Pawn captures name the file they left: e.g. "exd5"; pawn moves: "e4"
+        if piece_type is PieceType.PAWN:
             if is_capture:
-                # Pawn captures: e.g., "exd5"
-                return f"{COL_NOTATION[from_col]}x{to_square}"
-            else:
-                # Pawn moves: e.g., "e4"
-                return to_square
-        else:
-            # Piece moves: e.g., "Nf3", "Bxe5"
-            capture_symbol = "x" if is_capture else ""
-            return f"{piece_symbol}{capture_symbol}{to_square}"
+                return COL_NOTATION[from_col] + "x" + to_square
+            return to_square
+
+        # Piece moves: e.g., "Nf3", "Bxe5"
+        if is_capture:
+            return PIECE_SYMBOL[piece_type.code] + "x" + to_square
+        return PIECE_SYMBOL[piece_type.code] + to_square
 
     @staticmethod
-    def get_all_legal_moves(
-        grid: list[list[Piece]],
+    def _pawn_move_sets(
+        state: BoardState,
+        pawns: int,
         player: PlayerType,
-        en_passant_target: tuple[int, int] | None = None,
-    ) -> list[tuple[int, int, int, int]]:
-        """Get all legal moves for a player (moves that don't leave king in check)."""
-        legal_moves = []
+        ep_sq: int,
+    ) -> tuple[tuple[int, int], ...]:
+        """Set-wise pseudo-legal pawn destinations for every pawn at once.
+
+        Returns (targets, offset) pairs for single pushes, double pushes and
+        the two capture directions; each target's origin is ``to_sq + offset``.
+        """
+        occ = state.occ
+        single, double = pawn_pushes(pawns, player, ~occ & BB_ALL)
+        if player == PlayerType.WHITE:
+            enemy = state.black_occ
+            if ep_sq >= 0:
+                enemy |= (1 << ep_sq) & ~occ
+            west = (pawns >> 9) & ~FILE_H & enemy
+            east = (pawns >> 7) & ~FILE_A & enemy
+            return (single, 8), (double, 16), (west, 9), (east, 7)
+
+        enemy = state.white_occ
+        if ep_sq >= 0:
+            enemy |= (1 << ep_sq) & ~occ
+        west = (pawns << 7) & ~FILE_H & enemy
+        east = (pawns << 9) & ~FILE_A & enemy
+        return (single, -8), (double, -16), (west, -7), (east, -9)
+
+    @staticmethod
+    def _gen_knight_moves(sq: int, occ: int) -> int:
+        """Bitboard of squares a knight on sq reaches, own pieces included."""
+        return KNIGHT_ATTACKS[sq]
+
+    @staticmethod
+    def _gen_bishop_moves(sq: int, occ: int) -> int:
+        """Bitboard of squares a bishop on sq reaches, own pieces included."""
+        return bishop_attacks(sq, occ)
 
-        for from_row in range(8):
-            for from_col in range(8):
-                piece = grid[from_row][from_col]
+    @staticmethod
+    def _gen_rook_moves(sq: int, occ: int) -> int:
+        """Bitboard of squares a rook on sq reaches, own pieces included."""
+        return rook_attacks(sq, occ)
 
-                # Skip empty squares and opponent pieces
-                if piece.type == PieceType.NONE or piece.owner != player:
+    @staticmethod
+    def _gen_queen_moves(sq: int, occ: int) -> int:
+        """Bitboard of squares a queen on sq reaches, own pieces included."""
+        return rook_attacks(sq, occ) | bishop_attacks(sq, occ)
+
+    @staticmethod
+    def _gen_king_moves(sq: int, occ: int) -> int:
+        """Bitboard of squares a king on sq reaches (no castling)."""
+        return KING_ATTACKS[sq]
+
+    @staticmethod
+    def _iter_legal_moves(
+        state: BoardState,
+        player: PlayerType,
+        ep_sq: int = -1,
+        king_first: bool = False,
+    ) -> Iterator[int]:
+        """Yields the player's legal moves as packed ints (castling excluded).
+
+        With ``king_first`` a king in check yields its own steps before any
+        other move, as they are the likeliest escape.
+        """
+        # Pins and checks are computed once for the whole position
+        own_pieces = state.side(player)
+        king_sq = state.king_sq[player.code]
+        king = king_sq >= 0
+        pinned, checkers = ChessEngine.pins_and_checkers(state, player)
+        # Resolved once here rather than on every candidate move
+        is_legal = ChessEngine._is_legal_move
+        occ = state.occ
+        not_own = ~state.occupancy(player)
+
+        # Out of check, moves of unpinned pieces other than the king are legal
+        # as generated; everything else goes through the full legality test
+        if not king:
+            needs_test = 0
+        elif checkers:
+            needs_test = BB_ALL
+        else:
+            needs_test = pinned | (1 << king_sq)
+        # En passant captures can uncover the king and are always tested
+        ep_bit = 1 << ep_sq if king and ep_sq >= 0 else 0
+
+        # King steps tried up front are masked out of the piece loop below
+        done = 0
+        if king_first and king and checkers:
+            done = 1 << king_sq
+            for to_sq in iter_bits(KING_ATTACKS[king_sq] & not_own):
+                if is_legal(state, player, king_sq, to_sq, king_sq, pinned, checkers):
+                    yield king_sq | (to_sq << 6)
+
+        # Pawns are generated set-wise and each origin recovered by offset
+        for targets, offset in ChessEngine._pawn_move_sets(
+            state, own_pieces[0], player, ep_sq
+        ):
+            promotions = targets & (RANK_1 | RANK_8)
+            for to_sq in iter_bits(targets):
+                from_sq = to_sq + offset
+                if not (needs_test >> from_sq & 1 or ep_bit >> to_sq & 1) or is_legal(
+                    state, player, from_sq, to_sq, king_sq, pinned, checkers
+                ):
+                    yield from_sq | (to_sq << 6) | (promotions >> to_sq & 1) << 12
+
+        for pieces, generate in zip(
+            own_pieces[1:],
+            (
+                ChessEngine._gen_knight_moves,
+                ChessEngine._gen_bishop_moves,
+                ChessEngine._gen_rook_moves,
+                ChessEngine._gen_queen_moves,
+                ChessEngine._gen_king_moves,
+            ),
+        ):
+            for from_sq in iter_bits(pieces & ~done):
+                # Only the real destinations of this piece are visited
+                targets = generate(from_sq, occ) & not_own
+                if not needs_test >> from_sq & 1:
+                    for to_sq in iter_bits(targets):
+                        yield from_sq | (to_sq << 6)
                     continue
 
-                # Check all possible destination squares
-                for to_row in range(8):
-                    for to_col in range(8):
-                        # Check if the move is valid according to piece rules
-                        if ChessEngine.is_valid_move(
-                            grid, from_row, from_col, to_row, to_col, en_passant_target
-                        ):
-                            # Check if move would leave king in check
-                            if not ChessEngine.would_leave_king_in_check(
-                                grid, from_row, from_col, to_row, to_col, player
-                            ):
-                                legal_moves.append((from_row, from_col, to_row, to_col))
+                for to_sq in iter_bits(targets):
+                    # Check if move would leave king in check
+                    if is_legal(
+                        state, player, from_sq, to_sq, king_sq, pinned, checkers
+                    ):
+                        yield from_sq | (to_sq << 6)
 
-        return legal_moves
+    @staticmethod
+    def _has_any_legal_move(
+        state: BoardState,
+        player: PlayerType,
+        ep_sq: int = -1,
+    ) -> bool:
+        """Whether the player has at least one legal move, stopping at the first."""
+        key = (state.zobrist, player.code, ep_sq)
+        moves = _moves_cache.get(key)
+        if moves is not None:
+            return bool(moves)
+        if key in _has_move_cache:
+            _has_move_cache.move_to_end(key)
+            return _has_move_cache[key]
+
+        moves = ChessEngine._iter_legal_moves(state, player, ep_sq, king_first=True)
+        has_move = next(moves, None) is not None
+        _has_move_cache[key] = has_move
+        if len(_has_move_cache) > _HAS_MOVE_CACHE_SIZE:
+            _has_move_cache.popitem(last=False)
+        return has_move
+
+    @staticmethod
+    def has_any_legal_move(
+        grid: Board,
+        player: PlayerType,
+        en_passant_target: EnPassantTarget = None,
+    ) -> bool:
+        """Check if the player has any legal move (castling excluded)."""
+        return ChessEngine._has_any_legal_move(
+            _as_state(grid), player, _ep_square(en_passant_target)
+        )
+
+    @staticmethod
+    def _legal_moves(
+        state: BoardState,
+        player: PlayerType,
+        ep_sq: int = -1,
+    ) -> tuple[int, ...]:
+        """All packed legal moves for the position, served from the cache."""
+        key = (state.zobrist, player.code, ep_sq)
+        if key in _moves_cache:
+            _moves_cache.move_to_end(key)
+            return _moves_cache[key]
+
+        moves = tuple(ChessEngine._iter_legal_moves(state, player, ep_sq))
+        _moves_cache[key] = moves
+        if len(_moves_cache) > _MOVES_CACHE_SIZE:
+            _moves_cache.popitem(last=False)
+        return moves
+
+    @staticmethod
+    def get_legal_move_codes(
+        grid: Board,
+        player: PlayerType,
+        en_passant_target: EnPassantTarget = None,
+    ) -> array:
+        """Get all legal moves for a player packed as ints (see ``encode_move``).
+
+        Meant for search code that generates many move lists; castling is not
+        included, as in ``get_all_legal_moves``.
+        """
+        state = _as_state(grid)
+        return array(
+            "I", ChessEngine._legal_moves(state, player, _ep_square(en_passant_target))
+        )
+
+    @staticmethod
+    def get_all_legal_moves(
+        grid: Board,
+        player: PlayerType,
+        en_passant_target: EnPassantTarget = None,
+    ) -> list[tuple[int, int, int, int]]:
+        """Get all legal moves for a player (moves that don't leave king in check).
+
+        Castling is not included since castling rights are tracked by the
+        caller; see ``is_valid_castling``.
+        """
+        state = _as_state(grid)
+        return [
+            decode_move(move)
+            for move in ChessEngine._legal_moves(
+                state, player, _ep_square(en_passant_target)
+            )
+        ]
+
+    @staticmethod
+    def get_all_legal_moves_ordered(
+        grid: Board,
+        player: PlayerType,
+        en_passant_target: EnPassantTarget = None,
+        tt_move: tuple[int, int, int, int] | None = None,
+        killers: tuple[tuple[int, int, int, int], ...] = (),
+        history: list[list[int]] | None = None,
+    ) -> list[tuple[int, int, int, int]]:
+        """Get all legal moves ordered for alpha-beta search, best first.
+
+        The hash move comes first, then captures by MVV-LVA (most valuable
+        victim, least valuable attacker), then killer moves, then quiet moves
+        by their ``history[from_sq][to_sq]`` score. Ties keep generation order.
+        """
+        state = _as_state(grid)
+        mailbox = state.mailbox
+        scored = []
+        for move in ChessEngine._legal_moves(
+            state, player, _ep_square(en_passant_target)
+        ):
+            from_sq = move & 63
+            to_sq = (move >> 6) & 63
+            decoded = decode_move(move)
+            attacker = mailbox[from_sq] & 7
+            victim = mailbox[to_sq] & 7
+            if not victim and attacker == PAWN and (from_sq ^ to_sq) & 7:
+                victim = PAWN  # En passant lands on an empty square
+
+            if decoded == tt_move:
+                score = 2_000_000
+            elif victim:
+                score = 1_000_000 + 10 * _ORDER_VALUES[victim] - _ORDER_VALUES[attacker]
+            elif decoded in killers:
+                score = 900_000
+            elif history is not None:
+                score = history[from_sq][to_sq]
+            else:
+                score = 0
+            scored.append((score, decoded))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [move for _, move in scored]
 
     @staticmethod
     def is_checkmate(
-        grid: list[list[Piece]],
+        grid: Board,
         player: PlayerType,
-        en_passant_target: tuple[int, int] | None = None,
+        en_passant_target: EnPassantTarget = None,
     ) -> bool:
         """Check if the given player is in checkmate."""
+        state = _as_state(grid)
+
         # Must be in check to be checkmate
-        if not ChessEngine.is_in_check(grid, player):
+        if not ChessEngine.is_in_check(state, player):
             return False
 
         # If in check and no legal moves, it's checkmate
-        legal_moves = ChessEngine.get_all_legal_moves(grid, player, en_passant_target)
-        return len(legal_moves) == 0
+        return not ChessEngine._has_any_legal_move(
+            state, player, _ep_square(en_passant_target)
+        )
 
     @staticmethod
     def is_stalemate(
-        grid: list[list[Piece]],
+        grid: Board,
         player: PlayerType,
-        en_passant_target: tuple[int, int] | None = None,
+        en_passant_target: EnPassantTarget = None,
     ) -> bool:
         """Check if the given player is in stalemate."""
+        state = _as_state(grid)
+
         # Must NOT be in check to be stalemate
-        if ChessEngine.is_in_check(grid, player):
+        if ChessEngine.is_in_check(state, player):
             return False
 
         # If not in check and no legal moves, it's stalemate
-        legal_moves = ChessEngine.get_all_legal_moves(grid, player, en_passant_target)
-        return len(legal_moves) == 0
+        return not ChessEngine._has_any_legal_move(
+            state, player, _ep_square(en_passant_target)
+        )
+
+    @staticmethod
+    def position_key(
+        grid: Board,
+        player: PlayerType,
+        castling_rights: int = CASTLE_ALL,
+        en_passant_target: EnPassantTarget = None,
+    ) -> int:
+        """Zobrist key of the full position, for repetition detection.
+
+        Extends the piece placement hash with the side to move, the castling
+        rights (``CASTLE_*`` bits) and the en passant file.
+        """
+        key = _as_state(grid).zobrist ^ ZOBRIST_CASTLING[castling_rights]
+        if player.code:
+            key ^= ZOBRIST_BLACK_TO_MOVE
+        ep_sq = _ep_square(en_passant_target)
+        if ep_sq >= 0:
+            key ^= ZOBRIST_EP_FILE[ep_sq & 7]
+        return key
+
+
+# Move validators indexed by the mailbox piece type bits
+_VALIDATORS = (
+    None,  # Empty squares are rejected before dispatch
+    ChessEngine._is_valid_pawn_move,
+    ChessEngine._is_valid_knight_move,
+    ChessEngine._is_valid_bishop_move,
+    ChessEngine._is_valid_rook_move,
+    ChessEngine._is_valid_queen_move,
+    ChessEngine._is_valid_king_move,
+)
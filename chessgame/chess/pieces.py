@@ -3,6 +3,21 @@
 import dataclasses
 from enum import Enum
 
+# Plain int codes for the hot loops, where enum hashing is too slow
+NONE, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(7)
+WHITE, BLACK, NO_OWNER = range(3)
+
+_PIECE_CODES = {
+    "none": NONE,
+    "pawn": PAWN,
+    "knight": KNIGHT,
+    "bishop": BISHOP,
+    "rook": ROOK,
+    "queen": QUEEN,
+    "king": KING,
+}
+_PLAYER_CODES = {"W": WHITE, "B": BLACK, "none": NO_OWNER}
+
 
 class PieceType(Enum):
     """Enum for piece types."""
@@ -15,6 +30,9 @@ class PieceType(Enum):
     KING = "king"
     NONE = "none"
 
+    def __init__(self, value: str) -> None:
+        self.code = _PIECE_CODES[value]
+
 
 class PlayerType(Enum):
     """Enum for player types."""
@@ -23,10 +41,18 @@ class PlayerType(Enum):
     BLACK = "B"
     NONE = "none"
 
+    def __init__(self, value: str) -> None:
+        self.code = _PLAYER_CODES[value]
+
 
-@dataclasses.dataclass
+# Enum members indexed by their int code
+PIECE_TYPES = tuple(sorted(PieceType, key=lambda piece_type: piece_type.code))
+PLAYERS = tuple(sorted(PlayerType, key=lambda player: player.code))
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
 class Piece:
-    """Class for chess pieces."""
+    """Class for chess pieces, immutable so instances can be shared."""
 
     type: PieceType
     owner: PlayerType
@@ -39,3 +65,11 @@ class Piece:
 
 # Constant for empty squares
 NO_PIECE = Piece(PieceType.NONE, PlayerType.NONE)
+
+# The only Piece instances ever needed, so pieces can be compared with `is`
+PIECES = {
+    (piece_type, owner): Piece(piece_type, owner)
+    for piece_type in PIECE_TYPES[PAWN:]
+    for owner in PLAYERS[:NO_OWNER]
+}
+PIECES[PieceType.NONE, PlayerType.NONE] = NO_PIECE
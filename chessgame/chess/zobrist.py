@@ -0,0 +1,17 @@
+"""Zobrist keys for hashing board positions."""
+
+import random
+
+# Fixed seed so hashes are stable across processes
+_rng = random.Random(0x5EED_C4E55)
+
+# ZOBRIST[piece][sq]: one random 64-bit key per piece bitboard and square,
+# with pieces ordered as the BoardState fields (WP, WN, ..., BQ, BK)
+ZOBRIST = tuple(tuple(_rng.getrandbits(64) for _ in range(64)) for _ in range(12))
+
+# Keys for the rest of the position, drawn after the piece keys so those stay
+# unchanged: side to move, each 4-bit castling rights value and the file of
+# the en passant target square
+ZOBRIST_BLACK_TO_MOVE = _rng.getrandbits(64)
+ZOBRIST_CASTLING = tuple(_rng.getrandbits(64) for _ in range(16))
+ZOBRIST_EP_FILE = tuple(_rng.getrandbits(64) for _ in range(8))
@@ -1,22 +1,66 @@
 """Welcome to Reflex! This file outlines the steps to create a basic app."""
 
+import logging
 from typing import Any, Callable
 import reflex as rx
 import reflex_enterprise as rxe
 from reflex_enterprise.components.dnd import DragSourceMonitor, DropTargetMonitor
 
-from .chess import Piece, PieceType, PlayerType, NO_PIECE
-from .chess.board import create_default_board, copy_board
-from .chess.engine import ChessEngine
+from .chess import Piece, PieceType, PlayerType
+from .chess.bitboard import BoardState, mb_owner, mb_type, square_index
+from .chess.board import create_default_board, create_default_state, copy_board
+from .chess.engine import (
+    CASTLE_ALL,
+    CASTLE_CLEAR,
+    CASTLE_WHITE_KINGSIDE,
+    CASTLE_WHITE_QUEENSIDE,
+    PIECE_SYMBOL,
+    ChessEngine,
+)
+from .chess.pieces import KING, PIECE_TYPES, PLAYERS, WHITE
+
+logger = logging.getLogger(__name__)
+
+# Starting position built once; new states and resets copy these templates
+_DEFAULT_BOARD = create_default_board()
+_DEFAULT_STATE = create_default_state()
+# Repetition key of the starting position, which counts as its first occurrence
+_START_KEY = ChessEngine.position_key(_DEFAULT_STATE, PlayerType.WHITE)
+
+# Enum members by the string values carried in drag payloads
+_PIECE_TYPE_BY_VALUE = {piece_type.value: piece_type for piece_type in PieceType}
+_PLAYER_BY_VALUE = {player.value: player for player in PlayerType}
+
+# "owner type" label of the piece with each mailbox code, for the move history
+_MOVER_LABELS = tuple(
+    (
+        f"{PLAYERS[mb_owner(code)].value} {PIECE_TYPES[mb_type(code)].value}"
+        if mb_type(code) <= KING
+        else ""
+    )
+    for code in range(16)
+)
+
+
+def _format_move(number: int, move: tuple[int, int, int, int, int, str]) -> str:
+    """Formats a move history record as shown in the debug panel."""
+    code, from_row, from_col, to_row, to_col, notation = move
+    return (
+        f"{number}. {_MOVER_LABELS[code]} ({from_row},{from_col})"
+        f"→({to_row},{to_col}) [{notation}]"
+    )
 
 
 class ChessState(rx.State):
     """The app state."""
 
     grid: rx.Field[list[list[Piece]]] = rx.field(
-        default_factory=lambda: copy_board(create_default_board())
+        default_factory=lambda: copy_board(_DEFAULT_BOARD)
     )
 
+    # Backend-only bitboard position the rules run on; grid is its rendered view
+    _board: BoardState = _DEFAULT_STATE.copy()
+
     current_player: rx.Field[PlayerType] = rx.field(
         default_factory=lambda: PlayerType.WHITE
     )
@@ -33,13 +77,8 @@ class ChessState(rx.State):
         default_factory=lambda: ""
     )  # "WHITE", "BLACK", or "DRAW"
 
-    # Castling rights - track if king/rooks have moved
-    white_king_moved: rx.Field[bool] = rx.field(default_factory=lambda: False)
-    white_kingside_rook_moved: rx.Field[bool] = rx.field(default_factory=lambda: False)
-    white_queenside_rook_moved: rx.Field[bool] = rx.field(default_factory=lambda: False)
-    black_king_moved: rx.Field[bool] = rx.field(default_factory=lambda: False)
-    black_kingside_rook_moved: rx.Field[bool] = rx.field(default_factory=lambda: False)
-    black_queenside_rook_moved: rx.Field[bool] = rx.field(default_factory=lambda: False)
+    # Castling rights still available, as CASTLE_* bits (KQkq)
+    castling_rights: rx.Field[int] = rx.field(default_factory=lambda: CASTLE_ALL)
 
     # En passant - track target square for en passant capture
     en_passant_target: rx.Field[tuple[int, int] | None] = rx.field(
@@ -55,60 +94,49 @@ class ChessState(rx.State):
     )
 
     # Move history
-    move_history: rx.Field[list[str]] = rx.field(default_factory=lambda: [])
+    # One (mover mailbox code, from_row, from_col, to_row, to_col, notation)
+    # record per move; the text is formatted when rendered
+    move_history: rx.Field[list[tuple[int, int, int, int, int, str]]] = rx.field(
+        default_factory=lambda: []
+    )
 
     # Draw rules tracking
     halfmove_clock: rx.Field[int] = rx.field(
         default_factory=lambda: 0
     )  # For 50-move rule
-    position_history: rx.Field[list[str]] = rx.field(
-        default_factory=lambda: []
-    )  # For threefold repetition
+    # For threefold repetition: position keys from the start and after each
+    # move, and how often each key occurs among them (backend-only)
+    _position_stack: list[int] = [_START_KEY]
+    _position_counts: dict[int, int] = {_START_KEY: 1}
 
-    # Captured pieces tracking
-    captured_white_pieces: rx.Field[list[Piece]] = rx.field(default_factory=lambda: [])
-    captured_black_pieces: rx.Field[list[Piece]] = rx.field(default_factory=lambda: [])
+    # Captured pieces tracking, as the image path of each captured piece
+    captured_white_pieces: rx.Field[list[str]] = rx.field(default_factory=lambda: [])
+    captured_black_pieces: rx.Field[list[str]] = rx.field(default_factory=lambda: [])
 
-    # Undo functionality - store board states and game states
-    board_history: rx.Field[list[list[list[Piece]]]] = rx.field(
-        default_factory=lambda: []
-    )
-    player_history: rx.Field[list[PlayerType]] = rx.field(default_factory=lambda: [])
-    captured_white_history: rx.Field[list[list[Piece]]] = rx.field(
-        default_factory=lambda: []
-    )
-    captured_black_history: rx.Field[list[list[Piece]]] = rx.field(
-        default_factory=lambda: []
-    )
-    en_passant_history: rx.Field[list[tuple[int, int] | None]] = rx.field(
-        default_factory=lambda: []
-    )
-    halfmove_clock_history: rx.Field[list[int]] = rx.field(default_factory=lambda: [])
-    position_history_snapshots: rx.Field[list[list[str]]] = rx.field(
-        default_factory=lambda: []
-    )
+    # Undo functionality - one backend-only record per move, holding
+    # (from_sq, to_sq, captured_sq, captured_code, moved_code, en passant
+    # square before the move or -1, castling rights, halfmove clock, player code,
+    # position stack length); pieces are mailbox codes
+    _undo_log: list[tuple[int, ...]] = []
 
     @rx.event
     def reset_grid(self):
         """Resets the grid to the default state."""
-        self.grid = copy_board(create_default_board())
+        self._board = _DEFAULT_STATE.copy()
+        self.grid = self._board.to_grid()
         self.current_player = PlayerType.WHITE
         self.game_over = False
         self.winner = ""
         self.move_history = []
         # Reset draw rules tracking
         self.halfmove_clock = 0
-        self.position_history = []
+        self._position_stack = [_START_KEY]
+        self._position_counts = {_START_KEY: 1}
         # Reset captured pieces
         self.captured_white_pieces = []
         self.captured_black_pieces = []
         # Reset castling rights
-        self.white_king_moved = False
-        self.white_kingside_rook_moved = False
-        self.white_queenside_rook_moved = False
-        self.black_king_moved = False
-        self.black_kingside_rook_moved = False
-        self.black_queenside_rook_moved = False
+        self.castling_rights = CASTLE_ALL
         # Reset en passant
         self.en_passant_target = None
         # Reset promotion
@@ -116,14 +144,8 @@ class ChessState(rx.State):
         self.promotion_row = -1
         self.promotion_col = -1
         self.promotion_player = PlayerType.NONE
-        # Initialize history with starting position
-        self.board_history = [copy_board(self.grid)]
-        self.player_history = [PlayerType.WHITE]
-        self.captured_white_history = [[]]  # Start with empty captured pieces
-        self.captured_black_history = [[]]
-        self.en_passant_history = [None]  # Start with no en passant target
-        self.halfmove_clock_history = [0]  # Start with halfmove clock at 0
-        self.position_history_snapshots = [[]]  # Start with empty position history
+        # Clear undo history
+        self._undo_log = []
         return rx.toast("Game reset! White starts.")
 
     @rx.event
@@ -137,18 +159,29 @@ class ChessState(rx.State):
     def copy_move_history(self):
         """Copies the move history to clipboard."""
         history_text = (
-            "\n".join(self.move_history) if self.move_history else "No moves yet"
+            "\n".join(
+                _format_move(number, move)
+                for number, move in enumerate(self.move_history, 1)
+            )
+            if self.move_history
+            else "No moves yet"
         )
         return [
             rx.set_clipboard(history_text),
             rx.toast("Move history copied to clipboard!"),
         ]
 
+    def _refresh_squares(self, *squares: int):
+        """Copies the given squares from the bitboards into the rendered grid."""
+        grid = self.grid
+        for sq in squares:
+            row, col = divmod(sq, 8)
+            grid[row][col] = self._board.piece_at(sq)
+
     @rx.event
     def undo_last_move(self):
         """Undo the last move."""
-        # Need at least 2 states (starting position + 1 move) to undo
-        if len(self.board_history) < 2:
+        if not self._undo_log:
             return rx.toast("No moves to undo!")
 
         # Can't undo if game is over
@@ -157,24 +190,65 @@ class ChessState(rx.State):
 
         # Remove the last move from history
         self.move_history.pop()
-
-        # Remove current state and restore previous state
-        self.board_history.pop()  # Remove current board state
-        self.player_history.pop()  # Remove current player state
-        self.captured_white_history.pop()  # Remove current captured white pieces
-        self.captured_black_history.pop()  # Remove current captured black pieces
-        self.en_passant_history.pop()  # Remove current en passant target
-        self.halfmove_clock_history.pop()  # Remove current halfmove clock
-        self.position_history_snapshots.pop()  # Remove current position history snapshot
-
-        # Restore previous board, player, captured pieces, en passant target, and draw rule states
-        self.grid = copy_board(self.board_history[-1])
-        self.current_player = self.player_history[-1]
-        self.captured_white_pieces = self.captured_white_history[-1].copy()
-        self.captured_black_pieces = self.captured_black_history[-1].copy()
-        self.en_passant_target = self.en_passant_history[-1]
-        self.halfmove_clock = self.halfmove_clock_history[-1]
-        self.position_history = self.position_history_snapshots[-1].copy()
+        (
+            from_sq,
+            to_sq,
+            captured_sq,
+            captured_code,
+            moved_code,
+            en_passant_sq,
+            castling_rights,
+            halfmove_clock,
+            player_code,
+            position_count,
+        ) = self._undo_log.pop()
+
+        # Take the move back on the board: the mover (a pawn again if it
+        # promoted) returns to its square and any captured piece reappears
+        board = self._board
+        board.clear_square(to_sq)
+        board.put_piece(
+            from_sq, PIECE_TYPES[mb_type(moved_code)], PLAYERS[mb_owner(moved_code)]
+        )
+        if captured_code:
+            board.put_piece(
+                captured_sq,
+                PIECE_TYPES[mb_type(captured_code)],
+                PLAYERS[mb_owner(captured_code)],
+            )
+            if mb_owner(captured_code) == WHITE:
+                self.captured_white_pieces.pop()
+            else:
+                self.captured_black_pieces.pop()
+        self._refresh_squares(from_sq, to_sq, captured_sq)
+        if mb_type(moved_code) == KING and abs(to_sq - from_sq) == 2:
+            # Castling: put the rook back in its corner
+            back_rank = from_sq - from_sq % 8
+            if to_sq > from_sq:
+                rook_from_sq, rook_to_sq = back_rank + 5, back_rank + 7
+            else:
+                rook_from_sq, rook_to_sq = back_rank + 3, back_rank
+            board.move_piece(rook_from_sq, rook_to_sq)
+            self._refresh_squares(rook_from_sq, rook_to_sq)
+
+        # Restore player, en passant target, castling rights and draw rule states
+        self.current_player = PLAYERS[player_code]
+        self.en_passant_target = (
+            divmod(en_passant_sq, 8) if en_passant_sq >= 0 else None
+        )
+        self.castling_rights = castling_rights
+        self.halfmove_clock = halfmove_clock
+        while len(self._position_stack) > position_count:
+            key = self._position_stack.pop()
+            self._position_counts[key] -= 1
+            if not self._position_counts[key]:
+                del self._position_counts[key]
+
+        # An undone promotion no longer waits for a piece choice
+        self.promotion_pending = False
+        self.promotion_row = -1
+        self.promotion_col = -1
+        self.promotion_player = PlayerType.NONE
 
         # Reset game over state in case we had a checkmate/stalemate
         self.game_over = False
@@ -187,13 +261,15 @@ class ChessState(rx.State):
         """Called when starting to drag a piece."""
         self.dragging_piece_row = row
         self.dragging_piece_col = col
-        print(f"Started dragging piece at ({row}, {col})")
+        logger.debug("Started dragging piece at (%d, %d)", row, col)
 
     @rx.event
     def end_drag(self):
         """Called when ending drag."""
-        print(
-            f"Ended dragging piece from ({self.dragging_piece_row}, {self.dragging_piece_col})"
+        logger.debug(
+            "Ended dragging piece from (%d, %d)",
+            self.dragging_piece_row,
+            self.dragging_piece_col,
         )
         self.dragging_piece_row = -1
         self.dragging_piece_col = -1
@@ -211,19 +287,19 @@ class ChessState(rx.State):
     ) -> bool:
         """Validates if a move is legal according to chess rules."""
         return ChessEngine.is_valid_move(
-            self.grid, from_row, from_col, to_row, to_col, self.en_passant_target
+            self._board, from_row, from_col, to_row, to_col, self.en_passant_target
         )
 
     def is_in_check(self, player: PlayerType) -> bool:
         """Check if the given player's king is in check."""
-        return ChessEngine.is_in_check(self.grid, player)
+        return ChessEngine.is_in_check(self._board, player)
 
     def would_leave_king_in_check(
         self, from_row: int, from_col: int, to_row: int, to_col: int, player: PlayerType
     ) -> bool:
         """Check if a move would leave the player's king in check."""
         return ChessEngine.would_leave_king_in_check(
-            self.grid, from_row, from_col, to_row, to_col, player
+            self._board, from_row, from_col, to_row, to_col, player
         )
 
     def is_castling_move(
@@ -231,44 +307,33 @@ class ChessState(rx.State):
     ) -> bool:
         """Check if this is a castling move."""
         return ChessEngine.is_castling_move(
-            self.grid, from_row, from_col, to_row, to_col
+            self._board, from_row, from_col, to_row, to_col
         )
 
     def is_valid_castling(
         self, from_row: int, from_col: int, to_row: int, to_col: int, player: PlayerType
     ) -> bool:
         """Check if castling move is valid."""
-        if player == PlayerType.WHITE:
-            return ChessEngine.is_valid_castling(
-                self.grid,
-                from_row,
-                from_col,
-                to_row,
-                to_col,
-                player,
-                self.white_king_moved,
-                self.white_kingside_rook_moved,
-                self.white_queenside_rook_moved,
-            )
-        else:
-            return ChessEngine.is_valid_castling(
-                self.grid,
-                from_row,
-                from_col,
-                to_row,
-                to_col,
-                player,
-                self.black_king_moved,
-                self.black_kingside_rook_moved,
-                self.black_queenside_rook_moved,
-            )
+        # Shift the player's two rights down to the white bit positions
+        rights = self.castling_rights >> 2 * player.code
+        return ChessEngine.is_valid_castling(
+            self._board,
+            from_row,
+            from_col,
+            to_row,
+            to_col,
+            player,
+            not rights & (CASTLE_WHITE_KINGSIDE | CASTLE_WHITE_QUEENSIDE),
+            not rights & CASTLE_WHITE_KINGSIDE,
+            not rights & CASTLE_WHITE_QUEENSIDE,
+        )
 
     def is_en_passant_move(
         self, from_row: int, from_col: int, to_row: int, to_col: int
     ) -> bool:
         """Check if this is an en passant capture."""
         return ChessEngine.is_en_passant_move(
-            self.grid, from_row, from_col, to_row, to_col, self.en_passant_target
+            self._board, from_row, from_col, to_row, to_col, self.en_passant_target
         )
 
     def is_pawn_promotion(
@@ -286,12 +351,17 @@ class ChessState(rx.State):
         # Convert string back to enum
         piece_type = PieceType(piece_type_str)
 
-        # Create promoted piece
-        promoted_piece = Piece(piece_type, self.promotion_player)
-        self.grid[self.promotion_row][self.promotion_col] = promoted_piece
+        # Replace the pawn with the promoted piece
+        self._board.put_piece(
+            square_index(self.promotion_row, self.promotion_col),
+            piece_type,
+            self.promotion_player,
+        )
+        self._refresh_squares(square_index(self.promotion_row, self.promotion_col))
 
         # Store promotion info before clearing state
         promotion_player = self.promotion_player
+        current_player = self.current_player
 
         # Clear promotion state
         self.promotion_pending = False
@@ -301,50 +371,23 @@ class ChessState(rx.State):
 
         # Add promotion notation to move history
         if self.move_history:
-            last_move = self.move_history[-1]
-            piece_symbol = {
-                PieceType.QUEEN: "Q",
-                PieceType.ROOK: "R",
-                PieceType.BISHOP: "B",
-                PieceType.KNIGHT: "N",
-            }.get(piece_type, "")
+            piece_symbol = PIECE_SYMBOL[piece_type.code]
 
             # Update last move with promotion notation
-            self.move_history[-1] = last_move.replace(
-                "[Promotion]", f"[{piece_symbol}]"
-            )
+            self.move_history[-1] = (*self.move_history[-1][:5], piece_symbol)
 
         # Update draw rules tracking - pawn promotion resets halfmove clock
         self.halfmove_clock = 0
 
         # Now switch turns (if validation enabled)
         if self.turn_validation_enabled:
-            self.current_player = (
-                PlayerType.BLACK
-                if self.current_player == PlayerType.WHITE
-                else PlayerType.WHITE
-            )
+            self.current_player = PLAYERS[current_player.code ^ 1]
 
         # Track position for threefold repetition (after turn switch)
-        current_position = self.get_position_string()
-        self.position_history.append(current_position)
-
-        # Save state for undo functionality (after promotion and turn switch)
-        self.board_history.append(copy_board(self.grid))
-        self.player_history.append(self.current_player)
-        self.captured_white_history.append(self.captured_white_pieces.copy())
-        self.captured_black_history.append(self.captured_black_pieces.copy())
-        self.en_passant_history.append(self.en_passant_target)
-        self.halfmove_clock_history.append(self.halfmove_clock)
-        self.position_history_snapshots.append(self.position_history.copy())
+        self._record_position()
 
         # Check if the move puts the opponent in check or ends the game
-        opponent = (
-            PlayerType.BLACK
-            if promotion_player == PlayerType.WHITE
-            else PlayerType.WHITE
-        )
-        opponent_in_check = self.is_in_check(opponent)
+        opponent_in_check = self.is_in_check(PLAYERS[promotion_player.code ^ 1])
 
         # Check for game ending conditions after the promotion
         game_ending_toast = self.check_game_ending_conditions()
@@ -360,6 +403,26 @@ class ChessState(rx.State):
         """Check if the current player is in check."""
         return self.is_in_check(self.current_player)
 
+    @rx.var
+    def piece_codes(self) -> list[str]:
+        """Image name ("owner_type") of the piece on each square, "" if empty."""
+        return [
+            (
+                ""
+                if piece.type is PieceType.NONE
+                else f"{piece.owner.value}_{piece.type.value}"
+            )
+            for row in self.grid
+            for piece in row
+        ]
+
+    @rx.var
+    def drag_source_sq(self) -> int:
+        """Square index of the piece being dragged, or -1 when not dragging."""
+        if self.dragging_piece_row == -1:
+            return -1
+        return square_index(self.dragging_piece_row, self.dragging_piece_col)
+
     def _get_chess_notation(
         self,
         piece_type: PieceType,
@@ -374,54 +437,24 @@ class ChessState(rx.State):
             piece_type, from_row, from_col, to_row, to_col, is_capture
         )
 
-    def get_position_string(self) -> str:
-        """Generate a string representation of the current position for threefold repetition."""
-        # Include board state, current player, castling rights, and en passant target
-        position_parts = []
-
-        # Board state
-        for row in self.grid:
-            row_str = ""
-            for piece in row:
-                if piece.type == PieceType.NONE:
-                    row_str += "."
-                else:
-                    piece_char = piece.type.value[0].lower()
-                    if piece.owner == PlayerType.WHITE:
-                        piece_char = piece_char.upper()
-                    row_str += piece_char
-            position_parts.append(row_str)
-
-        # Current player
-        position_parts.append(f"turn:{self.current_player.value}")
-
-        # Castling rights
-        castling = ""
-        if not self.white_king_moved and not self.white_kingside_rook_moved:
-            castling += "K"
-        if not self.white_king_moved and not self.white_queenside_rook_moved:
-            castling += "Q"
-        if not self.black_king_moved and not self.black_kingside_rook_moved:
-            castling += "k"
-        if not self.black_king_moved and not self.black_queenside_rook_moved:
-            castling += "q"
-        position_parts.append(f"castle:{castling}")
-
-        # En passant target
-        en_passant = (
-            "none"
-            if self.en_passant_target is None
-            else f"{self.en_passant_target[0]},{self.en_passant_target[1]}"
+    def _position_key(self) -> int:
+        """Zobrist key of the current position including side, castling and ep."""
+        return ChessEngine.position_key(
+            self._board,
+            self.current_player,
+            self.castling_rights,
+            self.en_passant_target,
         )
-        position_parts.append(f"ep:{en_passant}")
 
-        return "|".join(position_parts)
+    def _record_position(self) -> None:
+        """Counts the current position towards threefold repetition."""
+        key = self._position_key()
+        self._position_stack.append(key)
+        self._position_counts[key] = self._position_counts.get(key, 0) + 1
 
     def check_threefold_repetition(self) -> bool:
         """Check if the current position has occurred 3 times (threefold repetition)."""
-        current_position = self.get_position_string()
-        count = self.position_history.count(current_position)
-        return count >= 2  # Current position + 2 previous = 3 total
+        return self._position_counts.get(self._position_key(), 0) >= 3
 
     def check_fifty_move_rule(self) -> bool:
         """Check if 50 moves have passed without pawn move or capture."""
@@ -443,31 +476,31 @@ class ChessState(rx.State):
             self.winner = "DRAW"
             return rx.toast("Draw by threefold repetition!")
 
-        # Check current player for checkmate/stalemate
-        if ChessEngine.is_checkmate(
-            self.grid, self.current_player, self.en_passant_target
+        # Check current player for checkmate/stalemate: one early-exit search
+        # for a legal move, then the check status decides which it is
+        if ChessEngine.has_any_legal_move(
+            self._board, self.current_player, self.en_passant_target
         ):
-            self.game_over = True
+            return None
+
+        self.game_over = True
+        if self.is_in_check(self.current_player):
             self.winner = (
                 "BLACK" if self.current_player == PlayerType.WHITE else "WHITE"
             )
             winner_name = "Black" if self.winner == "BLACK" else "White"
             return rx.toast(f"Checkmate! {winner_name} wins!")
 
-        elif ChessEngine.is_stalemate(
-            self.grid, self.current_player, self.en_passant_target
-        ):
-            self.game_over = True
-            self.winner = "DRAW"
-            return rx.toast("Stalemate! The game is a draw.")
-
-        return None
+        self.winner = "DRAW"
+        return rx.toast("Stalemate! The game is a draw.")
 
     @classmethod
     def can_drag_piece(cls) -> Callable[[rx.Var[Any], DragSourceMonitor], rx.Var[bool]]:
         @rxe.static
         def _can_drag(item: rx.Var[Any], monitor: DragSourceMonitor) -> rx.Var[bool]:
-            return True  # Allow dragging all pieces for now
+            # Decided on the client from the flag chess_piece puts in the item,
+            # so drags of the wrong color never reach the server
+            return item.to(dict)["movable"].to(bool)
 
         return _can_drag
 
@@ -487,16 +520,19 @@ class ChessState(rx.State):
         data: dict,
     ):
         """Handles the drop event for a chess piece."""
-        print(f"Drop event: target=({row}, {col}), data={data}")
-
+        logger.debug("Drop event: target=(%d, %d), data=%s", row, col, data)
+        try:
+            return self._drop_piece(row, col, data)
+        finally:
+            # Every drop ends the drag, whatever its outcome
+            self.end_drag()
+
+    def _drop_piece(self, row: int, col: int, data: dict):
+        """Validates and plays a dropped piece, returning the toast to show."""
         # Prevent moves if game is over
         if self.game_over:
             return rx.toast("Game is over! Reset to play again.")
 
-        # Set drag state if not already set (for highlighting)
-        if data and "row" in data and "col" in data and self.dragging_piece_row == -1:
-            self.start_drag(data["row"], data["col"])
-
         # Extract the dropped item data
         if data and "row" in data and "col" in data:
             source_row = data.get("row")
@@ -504,9 +540,9 @@ class ChessState(rx.State):
             piece_type_str = data.get("piece_type")
             piece_owner_str = data.get("piece_owner")
 
-            # Convert string values back to enums
-            piece_type = PieceType(piece_type_str) if piece_type_str else None
-            piece_owner = PlayerType(piece_owner_str) if piece_owner_str else None
+            # Convert string values back to enums, None for unknown values
+            piece_type = _PIECE_TYPE_BY_VALUE.get(piece_type_str)
+            piece_owner = _PLAYER_BY_VALUE.get(piece_owner_str)
 
             # Move the piece
             if (
@@ -517,21 +553,19 @@ class ChessState(rx.State):
             ):
                 # Check if dropping on the same square (cancel move)
                 if source_row == row and source_col == col:
-                    self.end_drag()
                     return rx.toast("Move cancelled")
 
                 # Check if it's the correct player's turn (if validation enabled)
-                if self.turn_validation_enabled and piece_owner != self.current_player:
-                    self.end_drag()
-                    return rx.toast(f"It's {self.current_player.value}'s turn!")
+                current_player = self.current_player
+                turn_validation_enabled = self.turn_validation_enabled
+                if turn_validation_enabled and piece_owner != current_player:
+                    return rx.toast(f"It's {current_player.value}'s turn!")
 
                 # Check if destination square is occupied by own piece
-                destination_piece = self.grid[row][col]
-                if (
-                    destination_piece.type != PieceType.NONE
-                    and destination_piece.owner == piece_owner
-                ):
-                    self.end_drag()
+                board = self._board
+                source_sq = square_index(source_row, source_col)
+                target_sq = square_index(row, col)
+                if board.occupancy(piece_owner) >> target_sq & 1:
                     return rx.toast("Cannot capture your own piece!")
 
                 # Check for special moves
@@ -548,41 +582,57 @@ class ChessState(rx.State):
                     if not self.is_valid_castling(
                         source_row, source_col, row, col, piece_owner
                     ):
-                        self.end_drag()
                         return rx.toast("Invalid castling move!")
                 else:
                     # Validate regular move according to chess rules
                     if not self.is_valid_move(source_row, source_col, row, col):
-                        self.end_drag()
                         return rx.toast("Invalid move for this piece!")
 
                     # Check if this move would leave the player's own king in check
                     if self.would_leave_king_in_check(
                         source_row, source_col, row, col, piece_owner
                     ):
-                        self.end_drag()
                         return rx.toast("Cannot leave your king in check!")
 
-                # Create the piece object
-                moved_piece = Piece(piece_type, piece_owner)
-
-                # Check if capturing an opponent's piece
+                # Check if capturing an opponent's piece (own pieces were
+                # rejected above, so any occupied destination is an enemy)
                 is_capture = (
-                    not is_castling
-                    and destination_piece.type != PieceType.NONE
-                    and destination_piece.owner != piece_owner
+                    not is_castling and bool(board.occ >> target_sq & 1)
                 ) or is_en_passant
 
                 # Track captured pieces for regular captures
-                if (
-                    is_capture
-                    and not is_en_passant
-                    and destination_piece.type != PieceType.NONE
-                ):
-                    if destination_piece.owner == PlayerType.WHITE:
-                        self.captured_white_pieces.append(destination_piece)
-                    else:
-                        self.captured_black_pieces.append(destination_piece)
+                destination_piece = board.piece_at(target_sq)
+                opponent = PLAYERS[piece_owner.code ^ 1]
+                captured_pieces = (
+                    self.captured_white_pieces
+                    if opponent == PlayerType.WHITE
+                    else self.captured_black_pieces
+                )
+                if is_capture and not is_en_passant:
+                    captured_pieces.append(_PIECE_IMAGES[board.mailbox[target_sq]])
+
+                # Remember what the move overwrites so it can be undone
+                captured_sq = (
+                    square_index(source_row, col) if is_en_passant else target_sq
+                )
+                self._undo_log.append(
+                    (
+                        source_sq,
+                        target_sq,
+                        captured_sq,
+                        board.mailbox[captured_sq],
+                        board.mailbox[source_sq],
+                        (
+                            square_index(*self.en_passant_target)
+                            if self.en_passant_target is not None
+                            else -1
+                        ),
+                        self.castling_rights,
+                        self.halfmove_clock,
+                        current_player.code,
+                        len(self._position_stack),
+                    )
+                )
 
                 if is_castling:
                     # Execute castling: move both king and rook
@@ -591,40 +641,25 @@ class ChessState(rx.State):
                     rook_to_col = 5 if is_kingside else 3
 
                     # Move king
-                    self.grid[row][col] = moved_piece
-                    self.grid[source_row][source_col] = NO_PIECE
+                    board.move_piece(source_sq, target_sq)
 
                     # Move rook
-                    rook_piece = self.grid[source_row][rook_from_col]
-                    self.grid[source_row][rook_to_col] = rook_piece
-                    self.grid[source_row][rook_from_col] = NO_PIECE
+                    rook_from_sq = square_index(source_row, rook_from_col)
+                    rook_to_sq = square_index(source_row, rook_to_col)
+                    board.move_piece(rook_from_sq, rook_to_sq)
+                    self._refresh_squares(rook_from_sq, rook_to_sq)
                 elif is_en_passant:
                     # Execute en passant: move pawn and remove captured pawn
-                    self.grid[row][col] = moved_piece
-                    self.grid[source_row][source_col] = NO_PIECE
-
-                    # Remove the captured pawn (on the same row as the moving pawn)
-                    captured_pawn_row = source_row
-                    captured_pawn = self.grid[captured_pawn_row][col]
+                    board.move_piece(source_sq, target_sq)
 
-                    # Track the captured pawn
-                    if captured_pawn.owner == PlayerType.WHITE:
-                        self.captured_white_pieces.append(captured_pawn)
-                    else:
-                        self.captured_black_pieces.append(captured_pawn)
-
-                    self.grid[captured_pawn_row][col] = NO_PIECE
+                    # Remove and track the captured pawn (on the same row as the
+                    # moving pawn)
+                    captured_pieces.append(_PIECE_IMAGES[board.mailbox[captured_sq]])
+                    board.clear_square(captured_sq)
                 elif is_promotion:
                     # Handle pawn promotion - move pawn but don't switch turns yet
-                    # Track captured piece if promoting with capture
-                    if destination_piece.type != PieceType.NONE:
-                        if destination_piece.owner == PlayerType.WHITE:
-                            self.captured_white_pieces.append(destination_piece)
-                        else:
-                            self.captured_black_pieces.append(destination_piece)
-
-                    self.grid[row][col] = moved_piece
-                    self.grid[source_row][source_col] = NO_PIECE
+                    # (a captured piece was already tracked above)
+                    board.move_piece(source_sq, target_sq)
 
                     # Set promotion state
                     self.promotion_pending = True
@@ -632,81 +667,61 @@ class ChessState(rx.State):
                     self.promotion_col = col
                     self.promotion_player = piece_owner
                 else:
-                    # Regular move: place piece at destination
-                    self.grid[row][col] = moved_piece
-                    # Clear source square
-                    self.grid[source_row][source_col] = NO_PIECE
-
-                # Update castling rights when pieces move
-                if piece_type == PieceType.KING:
-                    if piece_owner == PlayerType.WHITE:
-                        self.white_king_moved = True
-                    else:
-                        self.black_king_moved = True
-                elif piece_type == PieceType.ROOK:
-                    if piece_owner == PlayerType.WHITE:
-                        if source_col == 0:  # Queenside rook
-                            self.white_queenside_rook_moved = True
-                        elif source_col == 7:  # Kingside rook
-                            self.white_kingside_rook_moved = True
-                    else:  # Black
-                        if source_col == 0:  # Queenside rook
-                            self.black_queenside_rook_moved = True
-                        elif source_col == 7:  # Kingside rook
-                            self.black_kingside_rook_moved = True
+                    # Regular move: place piece at destination, clearing the source
+                    board.move_piece(source_sq, target_sq)
+
+                # Moving from or onto a king or rook home square drops its rights
+                castling_rights = (
+                    self.castling_rights
+                    & CASTLE_CLEAR[source_sq]
+                    & CASTLE_CLEAR[target_sq]
+                )
 
                 # Update en passant target
-                new_en_passant_target = ChessEngine.get_en_passant_target(
+                en_passant_target = ChessEngine.get_en_passant_target(
                     source_row, source_col, row, col, piece_type, piece_owner
                 )
-                self.en_passant_target = new_en_passant_target
-
-                # Reset drag tracking
-                self.end_drag()
 
                 # Update draw rules tracking (before switching turns)
                 # 50-move rule: increment halfmove clock unless pawn move or capture
                 if piece_type == PieceType.PAWN or is_capture:
-                    self.halfmove_clock = 0  # Reset on pawn move or capture
+                    halfmove_clock = 0  # Reset on pawn move or capture
                 else:
-                    self.halfmove_clock += 1
+                    halfmove_clock = self.halfmove_clock + 1
+
+                # Commit the move to state in one block, copying the squares it
+                # touched from the bitboards into the rendered grid
+                self._refresh_squares(source_sq, target_sq, captured_sq)
+                self.castling_rights, self.en_passant_target, self.halfmove_clock = (
+                    castling_rights,
+                    en_passant_target,
+                    halfmove_clock,
+                )
 
                 # For promotion moves, show promotion dialog and don't switch turns yet
                 if is_promotion:
                     # Add to move history without notation (will be updated after promotion)
-                    move_count = len(self.move_history) + 1
-                    move_detail = f"{move_count}. {piece_owner.value} {piece_type.value} ({source_row},{source_col})→({row},{col}) [Promotion]"
-                    self.move_history.append(move_detail)
+                    self.move_history.append(
+                        (
+                            board.mailbox[target_sq],
+                            source_row,
+                            source_col,
+                            row,
+                            col,
+                            "Promotion",
+                        )
+                    )
 
                     return rx.toast("Choose piece for pawn promotion!")
 
                 # Switch turns (if validation enabled)
-                if self.turn_validation_enabled:
-                    self.current_player = (
-                        PlayerType.BLACK
-                        if self.current_player == PlayerType.WHITE
-                        else PlayerType.WHITE
-                    )
+                if turn_validation_enabled:
+                    self.current_player = PLAYERS[current_player.code ^ 1]
 
                 # Track position for threefold repetition (after turn switch)
-                current_position = self.get_position_string()
-                self.position_history.append(current_position)
-
-                # Save state for undo functionality (after making the move and switching turns)
-                self.board_history.append(copy_board(self.grid))
-                self.player_history.append(self.current_player)
-                self.captured_white_history.append(self.captured_white_pieces.copy())
-                self.captured_black_history.append(self.captured_black_pieces.copy())
-                self.en_passant_history.append(self.en_passant_target)
-                self.halfmove_clock_history.append(self.halfmove_clock)
-                self.position_history_snapshots.append(self.position_history.copy())
+                self._record_position()
 
                 # Check if the move puts the opponent in check
-                opponent = (
-                    PlayerType.BLACK
-                    if piece_owner == PlayerType.WHITE
-                    else PlayerType.WHITE
-                )
                 opponent_in_check = self.is_in_check(opponent)
 
                 # Show appropriate message with chess notation
@@ -714,19 +729,29 @@ class ChessState(rx.State):
                     is_kingside = col > source_col
                     move_notation = "O-O" if is_kingside else "O-O-O"
                 elif is_en_passant:
-                    # En passant notation: e.g., "exd6 e.p."
-                    from_file = chr(ord("a") + source_col)
-                    to_square = f"{chr(ord('a') + col)}{8 - row}"
-                    move_notation = f"{from_file}x{to_square} e.p."
+                    # En passant notation: a pawn capture plus "e.p.", e.g. "exd6 e.p."
+                    move_notation = (
+                        self._get_chess_notation(
+                            piece_type, source_row, source_col, row, col, True
+                        )
+                        + " e.p."
+                    )
                 else:
                     move_notation = self._get_chess_notation(
                         piece_type, source_row, source_col, row, col, is_capture
                     )
 
                 # Add to move history with detailed info
-                move_count = len(self.move_history) + 1
-                move_detail = f"{move_count}. {piece_owner.value} {piece_type.value} ({source_row},{source_col})→({row},{col}) [{move_notation}]"
-                self.move_history.append(move_detail)
+                self.move_history.append(
+                    (
+                        board.mailbox[target_sq],
+                        source_row,
+                        source_col,
+                        row,
+                        col,
+                        move_notation,
+                    )
+                )
 
                 # Check for game ending conditions after the move
                 game_ending_toast = self.check_game_ending_conditions()
@@ -741,13 +766,8 @@ class ChessState(rx.State):
                     check_msg = " - Check!" if opponent_in_check else ""
                     if is_en_passant:
                         # For en passant, the captured piece is a pawn
-                        captured_owner = (
-                            PlayerType.BLACK
-                            if piece_owner == PlayerType.WHITE
-                            else PlayerType.WHITE
-                        )
                         return rx.toast(
-                            f"{move_notation} - Captured {captured_owner.value} pawn!{check_msg}",
+                            f"{move_notation} - Captured {opponent.value} pawn!{check_msg}",
                         )
                     else:
                         return rx.toast(
@@ -762,16 +782,36 @@ class ChessState(rx.State):
 
 pixel_piece_folder = "/pieces2/"
 
+# Image path of each piece indexed by mailbox byte, "" for codes with no piece
+_PIECE_IMAGES = tuple(
+    (
+        f"{pixel_piece_folder}{PLAYERS[code >> 3].value}_{PIECE_TYPES[code & 7].value}.png"
+        if 0 < code & 7 <= KING
+        else ""
+    )
+    for code in range(16)
+)
+
+# Drag and drop predicates are the same for every square, so build them once
+# instead of once per square render
+_CAN_DRAG = ChessState.can_drag_piece()
+_CAN_DROP = ChessState.can_drop_piece()
+
 
 def chess_piece(row: int, col: int) -> rx.Component:
     """
     Renders a chess piece based on the piece type.
     The piece type is determined by the state.
     """
-    piece = ChessState.grid[row][col]
-    ncond = (piece.type == PieceType.NONE) & (piece.owner == PlayerType.NONE)
+    code = ChessState.piece_codes[row * 8 + col]
+    # Owner and type come from the same flat entry, so a square never reads the
+    # nested grid
+    code_parts = code.split("_")
+    piece_owner = code_parts[0]
+    piece_type = code_parts[1]
+    ncond = code == ""
     still_piece = rx.image(
-        src=f"{pixel_piece_folder}{piece.owner}_{piece.type}.png",
+        src=f"{pixel_piece_folder}{code}.png",
         width="55px",
         height="55px",
         object_fit="contain",
@@ -779,14 +819,20 @@ def chess_piece(row: int, col: int) -> rx.Component:
 
     draggable_piece = rxe.dnd.draggable(
         still_piece,
-        type=piece.type.to(str),
+        type=piece_type.to(str),
         item={
             "row": row,
             "col": col,
-            "piece_type": piece.type,
-            "piece_owner": piece.owner,
+            "piece_type": piece_type,
+            "piece_owner": piece_owner,
+            # Only the side to move may pick up pieces while the game is on
+            "movable": ~ChessState.game_over
+            & (
+                ~ChessState.turn_validation_enabled
+                | (piece_owner == ChessState.current_player)
+            ),
         },
-        can_drag=ChessState.can_drag_piece(),  # type: ignore
+        can_drag=_CAN_DRAG,  # type: ignore
     )
 
     return rx.cond(
@@ -796,23 +842,30 @@ def chess_piece(row: int, col: int) -> rx.Component:
     )
 
 
+# Light and dark square colors
+_SQUARE_COLORS = ("#E7E5E4", "#44403C")
+
+# Drag types every square accepts: any real piece
+_ACCEPT_TYPES = [
+    PieceType.PAWN.value,
+    PieceType.KNIGHT.value,
+    PieceType.BISHOP.value,
+    PieceType.ROOK.value,
+    PieceType.QUEEN.value,
+    PieceType.KING.value,
+]
+
+
 @rx.memo
-def chess_square(row: int, col: int) -> rx.Component:
+def chess_square(row: int, col: int, base_color: str) -> rx.Component:
     """
     Renders a single square of the chessboard.
-    The color is determined by the row and column.
+    The base color is a literal picked by the board from the row and column.
     """
-    player_id = (row + col) % 2
-
-    # Check if this is the drag source by comparing coordinates directly
-    is_source = (
-        (ChessState.dragging_piece_row == row)
-        & (ChessState.dragging_piece_col == col)
-        & (ChessState.dragging_piece_row != -1)
-    )
+    # Check if this is the drag source through the single derived square index
+    is_source = ChessState.drag_source_sq == row * 8 + col
 
     # Determine background color
-    base_color = rx.cond(player_id == 0, "#E7E5E4", "#44403C")
     source_color = "#FFD700"  # Gold for drag source
 
     background_color = rx.cond(is_source, source_color, base_color)
@@ -829,16 +882,9 @@ def chess_square(row: int, col: int) -> rx.Component:
             align_items="center",
             justify_content="center",
         ),
-        can_drop=ChessState.can_drop_piece(),  # type: ignore
+        can_drop=_CAN_DROP,  # type: ignore
         on_drop=lambda data: ChessState.on_piece_drop(row, col, data),
-        accept=[
-            PieceType.PAWN.value,
-            PieceType.KNIGHT.value,
-            PieceType.BISHOP.value,
-            PieceType.ROOK.value,
-            PieceType.QUEEN.value,
-            PieceType.KING.value,
-        ],
+        accept=_ACCEPT_TYPES,
         cursor=rx.cond(
             rxe.dnd.Draggable.collected_params.is_dragging,
             "grabbing",
@@ -848,60 +894,63 @@ def chess_square(row: int, col: int) -> rx.Component:
     return drop_target
 
 
-def chessboard() -> rx.Component:
-    """
-    Renders the chessboard with row/column legends.
-    """
-    # Column labels (A-H)
-    col_labels = []
-    for i, col_letter in enumerate("ABCDEFGH"):
-        col_labels.append(
-            rx.box(
-                rx.text(col_letter, font_weight="bold", text_align="center"),
-                width="75px",
-                height="30px",
-                display="flex",
-                align_items="center",
-                justify_content="center",
-            )
-        )
-
-    # Create board rows with row labels
-    board_rows = []
-    for row in range(8):
-        # Row label (8, 7, 6, 5, 4, 3, 2, 1)
-        row_label = rx.box(
-            rx.text(str(8 - row), font_weight="bold", text_align="center"),
-            width="30px",
-            height="75px",
+# Board legends never change, so they are built once at import
+_COL_LABEL_ROW = rx.hstack(
+    rx.box(width="30px", height="30px"),  # Empty corner
+    *[
+        rx.box(
+            rx.text(col_letter, font_weight="bold", text_align="center"),
+            width="75px",
+            height="30px",
             display="flex",
             align_items="center",
             justify_content="center",
         )
+        for col_letter in "ABCDEFGH"
+    ],
+    spacing="0",
+    align_items="center",
+)
+# Row labels (8, 7, 6, 5, 4, 3, 2, 1)
+_ROW_LABELS = tuple(
+    rx.box(
+        rx.text(str(8 - row), font_weight="bold", text_align="center"),
+        width="30px",
+        height="75px",
+        display="flex",
+        align_items="center",
+        justify_content="center",
+    )
+    for row in range(8)
+)
 
-        # Row squares
-        row_squares = []
-        for col in range(8):
-            row_squares.append(chess_square(row=row, col=col))
 
-        # Combine row label with squares
-        board_rows.append(
-            rx.hstack(
-                row_label,
-                *row_squares,
-                spacing="0",
-                align_items="center",
-            )
+@rx.memo
+def chessboard() -> rx.Component:
+    """
+    Renders the chessboard with row/column legends.
+    """
+    # Create board rows with row labels
+    board_rows = [
+        rx.hstack(
+            _ROW_LABELS[row],
+            *[
+                chess_square(
+                    row=row,
+                    col=col,
+                    base_color=_SQUARE_COLORS[(row + col) % 2],
+                )
+                for col in range(8)
+            ],
+            spacing="0",
+            align_items="center",
         )
+        for row in range(8)
+    ]
 
     return rx.vstack(
         # Column labels
-        rx.hstack(
-            rx.box(width="30px", height="30px"),  # Empty corner
-            *col_labels,
-            spacing="0",
-            align_items="center",
-        ),
+        _COL_LABEL_ROW,
         # Board with row labels
         rx.vstack(
             *board_rows,
@@ -913,6 +962,125 @@ def chessboard() -> rx.Component:
     )
 
 
+# Promotion dialog styles, built once rather than on every render
+_PROMO_BACKDROP_BG = "linear-gradient(135deg, rgba(0,0,0,0.6), rgba(30,30,60,0.8))"
+
+# Promotion choices: (piece, label, tagline, label color, image background,
+# border color, image shadow, hover style)
+_PROMO_PIECES = (
+    (
+        "queen",
+        "Queen",
+        "Most Powerful",
+        "#ffd700",
+        "linear-gradient(145deg, rgba(255, 249, 230, 0.9), rgba(240, 230, 204, 0.9))",
+        "#ffd700",
+        "0 4px 15px rgba(255, 215, 0, 0.4)",
+        {
+            "background": "rgba(255, 215, 0, 0.15)",
+            "transform": "translateY(-3px) scale(1.02)",
+        },
+    ),
+    (
+        "rook",
+        "Rook",
+        "Castle Power",
+        "#4fc3f7",
+        "linear-gradient(145deg, rgba(232, 244, 253, 0.9), rgba(209, 233, 246, 0.9))",
+        "#2196F3",
+        "0 4px 15px rgba(33, 150, 243, 0.3)",
+        {
+            "background": "rgba(33, 150, 243, 0.15)",
+            "transform": "translateY(-3px) scale(1.02)",
+        },
+    ),
+    (
+        "bishop",
+        "Bishop",
+        "Diagonal Force",
+        "#ba68c8",
+        "linear-gradient(145deg, rgba(243, 229, 245, 0.9), rgba(225, 190, 231, 0.9))",
+        "#9C27B0",
+        "0 4px 15px rgba(156, 39, 176, 0.3)",
+        {
+            "background": "rgba(156, 39, 176, 0.15)",
+            "transform": "translateY(-3px) scale(1.02)",
+        },
+    ),
+    (
+        "knight",
+        "Knight",
+        "L-Shape Master",
+        "#ffb74d",
+        "linear-gradient(145deg, rgba(255, 243, 224, 0.9), rgba(255, 224, 178, 0.9))",
+        "#FF9800",
+        "0 4px 15px rgba(255, 152, 0, 0.3)",
+        {
+            "background": "rgba(255, 152, 0, 0.15)",
+            "transform": "translateY(-3px) scale(1.02)",
+        },
+    ),
+)
+
+
+def _promo_button(
+    name: str,
+    label: str,
+    tagline: str,
+    color: str,
+    background: str,
+    border_color: str,
+    shadow: str,
+    hover: dict,
+) -> rx.Component:
+    """Renders the button choosing one promotion piece."""
+    return rx.box(
+        rx.button(
+            rx.vstack(
+                rx.box(
+                    rx.image(
+                        src=f"{pixel_piece_folder}{ChessState.promotion_player}_{name}.png",
+                        width="70px",
+                        height="70px",
+                        object_fit="contain",
+                    ),
+                    padding="10px",
+                    border_radius="12px",
+                    background=background,
+                    border=f"2px solid {border_color}",
+                    box_shadow=shadow,
+                ),
+                rx.text(
+                    label,
+                    font_weight="bold",
+                    font_size="13px",
+                    color=color,
+                    margin_top="6px",
+                ),
+                rx.text(
+                    tagline,
+                    font_size="9px",
+                    color="#bbb",
+                    font_style="italic",
+                ),
+                spacing="1",
+                align="center",
+            ),
+            on_click=lambda: ChessState.promote_pawn(name),
+            background="transparent",
+            border="none",
+            padding="12px",
+            border_radius="12px",
+            _hover=hover,
+            transition="all 0.3s ease",
+            cursor="pointer",
+            width="130px",
+            height="140px",
+        ),
+        flex_shrink="0",
+    )
+
+
 def promotion_dialog() -> rx.Component:
     """Modal dialog for pawn promotion piece selection."""
     return rx.cond(
@@ -926,7 +1094,7 @@ def promotion_dialog() -> rx.Component:
                 position="fixed",
                 top="0",
                 left="0",
-                background="linear-gradient(135deg, rgba(0,0,0,0.6), rgba(30,30,60,0.8))",
+                background=_PROMO_BACKDROP_BG,
                 backdrop_filter="blur(5px)",
                 z_index="1000",
             ),
@@ -961,202 +1129,7 @@ def promotion_dialog() -> rx.Component:
                     ),
                     # Piece selection - single row with proper spacing
                     rx.hstack(
-                        # Queen - Golden option
-                        rx.box(
-                            rx.button(
-                                rx.vstack(
-                                    rx.box(
-                                        rx.image(
-                                            src=f"{pixel_piece_folder}{ChessState.promotion_player}_queen.png",
-                                            width="70px",
-                                            height="70px",
-                                            object_fit="contain",
-                                        ),
-                                        padding="10px",
-                                        border_radius="12px",
-                                        background="linear-gradient(145deg, rgba(255, 249, 230, 0.9), rgba(240, 230, 204, 0.9))",
-                                        border="2px solid #ffd700",
-                                        box_shadow="0 4px 15px rgba(255, 215, 0, 0.4)",
-                                    ),
-                                    rx.text(
-                                        "Queen",
-                                        font_weight="bold",
-                                        font_size="13px",
-                                        color="#ffd700",
-                                        margin_top="6px",
-                                    ),
-                                    rx.text(
-                                        "Most Powerful",
-                                        font_size="9px",
-                                        color="#bbb",
-                                        font_style="italic",
-                                    ),
-                                    spacing="1",
-                                    align="center",
-                                ),
-                                on_click=lambda: ChessState.promote_pawn("queen"),
-                                background="transparent",
-                                border="none",
-                                padding="12px",
-                                border_radius="12px",
-                                _hover={
-                                    "background": "rgba(255, 215, 0, 0.15)",
-                                    "transform": "translateY(-3px) scale(1.02)",
-                                },
-                                transition="all 0.3s ease",
-                                cursor="pointer",
-                                width="130px",
-                                height="140px",
-                            ),
-                            flex_shrink="0",
-                        ),
-                        # Rook - Strong option
-                        rx.box(
-                            rx.button(
-                                rx.vstack(
-                                    rx.box(
-                                        rx.image(
-                                            src=f"{pixel_piece_folder}{ChessState.promotion_player}_rook.png",
-                                            width="70px",
-                                            height="70px",
-                                            object_fit="contain",
-                                        ),
-                                        padding="10px",
-                                        border_radius="12px",
-                                        background="linear-gradient(145deg, rgba(232, 244, 253, 0.9), rgba(209, 233, 246, 0.9))",
-                                        border="2px solid #2196F3",
-                                        box_shadow="0 4px 15px rgba(33, 150, 243, 0.3)",
-                                    ),
-                                    rx.text(
-                                        "Rook",
-                                        font_weight="bold",
-                                        font_size="13px",
-                                        color="#4fc3f7",
-                                        margin_top="6px",
-                                    ),
-                                    rx.text(
-                                        "Castle Power",
-                                        font_size="9px",
-                                        color="#bbb",
-                                        font_style="italic",
-                                    ),
-                                    spacing="1",
-                                    align="center",
-                                ),
-                                on_click=lambda: ChessState.promote_pawn("rook"),
-                                background="transparent",
-                                border="none",
-                                padding="12px",
-                                border_radius="12px",
-                                _hover={
-                                    "background": "rgba(33, 150, 243, 0.15)",
-                                    "transform": "translateY(-3px) scale(1.02)",
-                                },
-                                transition="all 0.3s ease",
-                                cursor="pointer",
-                                width="130px",
-                                height="140px",
-                            ),
-                            flex_shrink="0",
-                        ),
-                        # Bishop - Elegant option
-                        rx.box(
-                            rx.button(
-                                rx.vstack(
-                                    rx.box(
-                                        rx.image(
-                                            src=f"{pixel_piece_folder}{ChessState.promotion_player}_bishop.png",
-                                            width="70px",
-                                            height="70px",
-                                            object_fit="contain",
-                                        ),
-                                        padding="10px",
-                                        border_radius="12px",
-                                        background="linear-gradient(145deg, rgba(243, 229, 245, 0.9), rgba(225, 190, 231, 0.9))",
-                                        border="2px solid #9C27B0",
-                                        box_shadow="0 4px 15px rgba(156, 39, 176, 0.3)",
-                                    ),
-                                    rx.text(
-                                        "Bishop",
-                                        font_weight="bold",
-                                        font_size="13px",
-                                        color="#ba68c8",
-                                        margin_top="6px",
-                                    ),
-                                    rx.text(
-                                        "Diagonal Force",
-                                        font_size="9px",
-                                        color="#bbb",
-                                        font_style="italic",
-                                    ),
-                                    spacing="1",
-                                    align="center",
-                                ),
-                                on_click=lambda: ChessState.promote_pawn("bishop"),
-                                background="transparent",
-                                border="none",
-                                padding="12px",
-                                border_radius="12px",
-                                _hover={
-                                    "background": "rgba(156, 39, 176, 0.15)",
-                                    "transform": "translateY(-3px) scale(1.02)",
-                                },
-                                transition="all 0.3s ease",
-                                cursor="pointer",
-                                width="130px",
-                                height="140px",
-                            ),
-                            flex_shrink="0",
-                        ),
-                        # Knight - Tactical option
-                        rx.box(
-                            rx.button(
-                                rx.vstack(
-                                    rx.box(
-                                        rx.image(
-                                            src=f"{pixel_piece_folder}{ChessState.promotion_player}_knight.png",
-                                            width="70px",
-                                            height="70px",
-                                            object_fit="contain",
-                                        ),
-                                        padding="10px",
-                                        border_radius="12px",
-                                        background="linear-gradient(145deg, rgba(255, 243, 224, 0.9), rgba(255, 224, 178, 0.9))",
-                                        border="2px solid #FF9800",
-                                        box_shadow="0 4px 15px rgba(255, 152, 0, 0.3)",
-                                    ),
-                                    rx.text(
-                                        "Knight",
-                                        font_weight="bold",
-                                        font_size="13px",
-                                        color="#ffb74d",
-                                        margin_top="6px",
-                                    ),
-                                    rx.text(
-                                        "L-Shape Master",
-                                        font_size="9px",
-                                        color="#bbb",
-                                        font_style="italic",
-                                    ),
-                                    spacing="1",
-                                    align="center",
-                                ),
-                                on_click=lambda: ChessState.promote_pawn("knight"),
-                                background="transparent",
-                                border="none",
-                                padding="12px",
-                                border_radius="12px",
-                                _hover={
-                                    "background": "rgba(255, 152, 0, 0.15)",
-                                    "transform": "translateY(-3px) scale(1.02)",
-                                },
-                                transition="all 0.3s ease",
-                                cursor="pointer",
-                                width="130px",
-                                height="140px",
-                            ),
-                            flex_shrink="0",
-                        ),
+                        *[_promo_button(*choice) for choice in _PROMO_PIECES],
                         spacing="5",
                         justify="center",
                         align="center",
@@ -1185,6 +1158,10 @@ def promotion_dialog() -> rx.Component:
     )
 
 
+# Client-side copy of the mover labels, indexed by the history records
+_MOVER_LABEL_VAR = rx.Var.create(list(_MOVER_LABELS))
+
+
 def debug_panel() -> rx.Component:
     """Debug panel with game controls and move history."""
     return rx.vstack(
@@ -1197,9 +1174,12 @@ def debug_panel() -> rx.Component:
                     rx.text(
                         "GAME OVER", color="red", font_weight="bold", font_size="lg"
                     ),
-                    rx.cond(
-                        ChessState.winner == "DRAW",
-                        rx.text("It's a draw!", color="orange", font_weight="bold"),
+                    rx.match(
+                        ChessState.winner,
+                        (
+                            "DRAW",
+                            rx.text("It's a draw!", color="orange", font_weight="bold"),
+                        ),
                         rx.text(
                             f"{ChessState.winner} wins!",
                             color="green",
@@ -1216,7 +1196,6 @@ def debug_panel() -> rx.Component:
                     rx.cond(
                         ChessState.current_player_in_check,
                         rx.text("IN CHECK!", color="#ff5722", font_weight="bold"),
-                        rx.text(""),
                     ),
                     spacing="1",
                     align="start",
@@ -1246,11 +1225,7 @@ def debug_panel() -> rx.Component:
                 color="white",
                 _hover={"background_color": "darkpurple"},
                 width="100%",
-                disabled=rx.cond(
-                    (ChessState.move_history.length() == 0) | ChessState.game_over,
-                    True,
-                    False,
-                ),
+                disabled=(ChessState.move_history.length() == 0) | ChessState.game_over,
             ),
             rx.button(
                 rx.cond(
@@ -1290,8 +1265,21 @@ def debug_panel() -> rx.Component:
             rx.box(
                 rx.foreach(
                     ChessState.move_history,
-                    lambda move: rx.text(
-                        move,
+                    lambda move, index: rx.text(
+                        index + 1,
+                        ". ",
+                        _MOVER_LABEL_VAR[move[0]],
+                        " (",
+                        move[1],
+                        ",",
+                        move[2],
+                        ")→(",
+                        move[3],
+                        ",",
+                        move[4],
+                        ") [",
+                        move[5],
+                        "]",
                         font_size="sm",
                         font_family="monospace",
                         color="#e0e0e0",
@@ -1342,8 +1330,8 @@ def captured_pieces_panel() -> rx.Component:
             rx.box(
                 rx.foreach(
                     ChessState.captured_white_pieces,
-                    lambda piece: rx.image(
-                        src=f"{pixel_piece_folder}{piece.owner}_{piece.type}.png",
+                    lambda src: rx.image(
+                        src=src,
                         width="30px",
                         height="30px",
                         object_fit="contain",
@@ -1381,8 +1369,8 @@ def captured_pieces_panel() -> rx.Component:
             rx.box(
                 rx.foreach(
                     ChessState.captured_black_pieces,
-                    lambda piece: rx.image(
-                        src=f"{pixel_piece_folder}{piece.owner}_{piece.type}.png",
+                    lambda src: rx.image(
+                        src=src,
                         width="30px",
                         height="30px",
                         object_fit="contain",
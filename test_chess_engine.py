@@ -1,9 +1,42 @@
 """Unit tests for the chess engine."""
 
 import pytest
-from chessgame.chess.pieces import Piece, PieceType, PlayerType, NO_PIECE
-from chessgame.chess.board import create_default_board
-from chessgame.chess.engine import ChessEngine
+from chessgame.chess.pieces import (
+    BLACK,
+    KING,
+    PIECE_TYPES,
+    PIECES,
+    PLAYERS,
+    WHITE,
+    Piece,
+    PieceType,
+    PlayerType,
+    NO_PIECE,
+)
+from chessgame.chess.attacks import (
+    BISHOP_DIRECTIONS,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    ROOK_DIRECTIONS,
+    ray_attacks,
+)
+from chessgame.chess.bitboard import BoardState, iter_bits, mailbox_code
+from chessgame.chess.board import copy_board, create_default_board, find_king
+from chessgame.chess.engine import (
+    CASTLE_ALL,
+    CASTLE_BLACK_KINGSIDE,
+    CASTLE_BLACK_QUEENSIDE,
+    CASTLE_CLEAR,
+    CASTLE_WHITE_KINGSIDE,
+    CASTLE_WHITE_QUEENSIDE,
+    MOVE_PROMOTION,
+    SQUARE_NAME,
+    ChessEngine,
+    decode_move,
+    encode_move,
+)
+from chessgame.chess.magic import bishop_attacks, rook_attacks
 
 
 class TestBasicMoves:
@@ -191,6 +224,14 @@ class TestCheckDetection:
         assert ChessEngine.is_in_check(board, PlayerType.WHITE)
         assert not ChessEngine.is_in_check(board, PlayerType.BLACK)
 
+    def test_check_with_known_king_square(self):
+        """Test check detection from a king square given by the caller."""
+        board = [[NO_PIECE for _ in range(8)] for _ in range(8)]
+        board[5][3] = Piece(PieceType.KING, PlayerType.WHITE)  # White king on d3
+        board[0][3] = Piece(PieceType.ROOK, PlayerType.BLACK)  # Black rook on d8
+
+        assert ChessEngine.is_in_check(board, PlayerType.WHITE, king_sq=5 * 8 + 3)
+
     def test_no_check(self):
         """Test when king is not in check."""
         board = create_default_board()
@@ -199,6 +240,106 @@ class TestCheckDetection:
         assert not ChessEngine.is_in_check(board, PlayerType.WHITE)
         assert not ChessEngine.is_in_check(board, PlayerType.BLACK)
 
+    def test_square_attacks_match_ray_scan(self):
+        """Test per-square attack queries agree with a direct ray scan."""
+        board = create_default_board()
+        board[4][4], board[6][4] = board[6][4], NO_PIECE  # e2-e4
+        board[3][3], board[1][3] = board[1][3], NO_PIECE  # d7-d5
+        state = BoardState.from_grid(board)
+        occ = state.occ
+        slider_directions = {
+            PieceType.BISHOP: BISHOP_DIRECTIONS,
+            PieceType.ROOK: ROOK_DIRECTIONS,
+            PieceType.QUEEN: ROOK_DIRECTIONS + BISHOP_DIRECTIONS,
+        }
+
+        for player in (PlayerType.WHITE, PlayerType.BLACK):
+            # Attack map built piece by piece, scanning each slider ray
+            attacked = 0
+            for row in range(8):
+                for col in range(8):
+                    piece = board[row][col]
+                    if piece.owner != player:
+                        continue
+                    sq = row * 8 + col
+                    if piece.type in slider_directions:
+                        attacked |= ray_attacks(sq, occ, slider_directions[piece.type])
+                    elif piece.type == PieceType.KNIGHT:
+                        attacked |= KNIGHT_ATTACKS[sq]
+                    elif piece.type == PieceType.KING:
+                        attacked |= KING_ATTACKS[sq]
+                    else:
+                        to_row = row - 1 if player == PlayerType.WHITE else row + 1
+                        for to_col in (col - 1, col + 1):
+                            if 0 <= to_col < 8:
+                                attacked |= 1 << (to_row * 8 + to_col)
+
+            for sq in range(64):
+                assert ChessEngine.is_square_under_attack(
+                    state, *divmod(sq, 8), player
+                ) == bool(attacked & (1 << sq))
+
+
+class TestPins:
+    """Test pin and checker detection used for legality."""
+
+    def test_pinned_piece_moves_along_pin_line(self):
+        """Test a pinned rook can only slide along the pin."""
+        board = [[NO_PIECE for _ in range(8)] for _ in range(8)]
+        board[7][4] = Piece(PieceType.KING, PlayerType.WHITE)  # King on e1
+        board[5][4] = Piece(PieceType.ROOK, PlayerType.WHITE)  # Rook on e3
+        board[0][4] = Piece(PieceType.ROOK, PlayerType.BLACK)  # Rook on e8
+
+        state = BoardState.from_grid(board)
+        pinned, checkers = ChessEngine.pins_and_checkers(state, PlayerType.WHITE)
+        assert pinned == 1 << (5 * 8 + 4)
+        assert checkers == 0
+
+        # Sideways move exposes the king, capture of the pinner does not
+        assert ChessEngine.would_leave_king_in_check(
+            board, 5, 4, 5, 0, PlayerType.WHITE
+        )
+        assert not ChessEngine.would_leave_king_in_check(
+            board, 5, 4, 0, 4, PlayerType.WHITE
+        )
+
+    def test_must_block_or_capture_checker(self):
+        """Test only blocking or capturing moves answer a single check."""
+        board = [[NO_PIECE for _ in range(8)] for _ in range(8)]
+        board[7][4] = Piece(PieceType.KING, PlayerType.WHITE)  # King on e1
+        board[7][0] = Piece(PieceType.ROOK, PlayerType.WHITE)  # Rook on a1
+        board[0][4] = Piece(PieceType.ROOK, PlayerType.BLACK)  # Rook on e8
+
+        legal_moves = ChessEngine.get_all_legal_moves(board, PlayerType.WHITE)
+        rook_moves = {move for move in legal_moves if move[:2] == (7, 0)}
+        assert rook_moves == set()
+        assert (7, 4, 7, 5) in legal_moves  # Ke1-f1
+        assert (7, 4, 6, 4) not in legal_moves  # Ke1-e2 stays on the file
+
+    def test_en_passant_discovered_check(self):
+        """Test en passant that removes both pawns from the king's rank."""
+        board = [[NO_PIECE for _ in range(8)] for _ in range(8)]
+        board[3][7] = Piece(PieceType.KING, PlayerType.WHITE)  # King on h5
+        board[3][4] = Piece(PieceType.PAWN, PlayerType.WHITE)  # Pawn on e5
+        board[3][3] = Piece(PieceType.PAWN, PlayerType.BLACK)  # Pawn on d5
+        board[3][0] = Piece(PieceType.ROOK, PlayerType.BLACK)  # Rook on a5
+
+        assert ChessEngine.would_leave_king_in_check(
+            board, 3, 4, 2, 3, PlayerType.WHITE
+        )
+
+    def test_en_passant_captures_checking_pawn(self):
+        """Test en passant may remove the pawn that gives check."""
+        board = [[NO_PIECE for _ in range(8)] for _ in range(8)]
+        board[4][4] = Piece(PieceType.KING, PlayerType.WHITE)  # King on e4
+        board[3][4] = Piece(PieceType.PAWN, PlayerType.WHITE)  # Pawn on e5
+        board[3][3] = Piece(PieceType.PAWN, PlayerType.BLACK)  # Pawn on d5, checking
+
+        assert ChessEngine.is_in_check(board, PlayerType.WHITE)
+        assert not ChessEngine.would_leave_king_in_check(
+            board, 3, 4, 2, 3, PlayerType.WHITE
+        )
+
 
 class TestCastling:
     """Test castling rules."""
@@ -306,6 +447,39 @@ class TestCastling:
             queenside_rook_moved=False,
         )
 
+    def test_invalid_castling_through_attacked_square(self):
+        """Test castling invalid when the king crosses an attacked square."""
+        board = [[NO_PIECE for _ in range(8)] for _ in range(8)]
+        board[0][4] = Piece(PieceType.KING, PlayerType.BLACK)  # King on e8
+        board[0][7] = Piece(PieceType.ROOK, PlayerType.BLACK)  # Rook on h8
+        board[0][0] = Piece(PieceType.ROOK, PlayerType.BLACK)  # Rook on a8
+        board[4][3] = Piece(PieceType.ROOK, PlayerType.WHITE)  # Rook on d4 hits d8
+
+        castling_rights = dict(
+            king_moved=False, kingside_rook_moved=False, queenside_rook_moved=False
+        )
+        assert not ChessEngine.is_valid_castling(
+            board, 0, 4, 0, 2, PlayerType.BLACK, **castling_rights
+        )
+        assert ChessEngine.is_valid_castling(
+            board, 0, 4, 0, 6, PlayerType.BLACK, **castling_rights
+        )
+
+    def test_castling_rights_clear_masks(self):
+        """Test castling rights lost when king or rook squares are touched."""
+        # King move from e1 drops both white rights
+        rights = CASTLE_ALL & CASTLE_CLEAR[60] & CASTLE_CLEAR[52]
+        assert rights == CASTLE_BLACK_KINGSIDE | CASTLE_BLACK_QUEENSIDE
+
+        # Capturing the h8 rook with a piece from a quiet square drops only k
+        rights = CASTLE_ALL & CASTLE_CLEAR[15] & CASTLE_CLEAR[7]
+        assert rights == CASTLE_ALL & ~CASTLE_BLACK_KINGSIDE
+
+        # a1 rook moving keeps the white kingside right
+        rights = CASTLE_ALL & CASTLE_CLEAR[56] & CASTLE_CLEAR[48]
+        assert rights & CASTLE_WHITE_KINGSIDE
+        assert not rights & CASTLE_WHITE_QUEENSIDE
+
 
 class TestCheckmate:
     """Test checkmate detection."""
@@ -331,6 +505,39 @@ class TestCheckmate:
         # White should be in checkmate
         assert ChessEngine.is_checkmate(board, PlayerType.WHITE)
         assert not ChessEngine.is_checkmate(board, PlayerType.BLACK)
+        assert not ChessEngine.has_any_legal_move(board, PlayerType.WHITE)
+        assert ChessEngine.has_any_legal_move(board, PlayerType.BLACK)
+
+    def test_has_any_legal_move_repeated(self):
+        """Test repeated legal move searches on one position agree."""
+        state = BoardState.from_grid([[NO_PIECE for _ in range(8)] for _ in range(8)])
+        state.put_piece(0, PieceType.KING, PlayerType.BLACK)  # a8
+        state.put_piece(2 * 8 + 1, PieceType.QUEEN, PlayerType.WHITE)  # b6
+        state.put_piece(7 * 8 + 7, PieceType.KING, PlayerType.WHITE)  # h1
+
+        # Stalemate: asked twice before any full move list exists
+        assert not ChessEngine.has_any_legal_move(state, PlayerType.BLACK)
+        assert not ChessEngine.has_any_legal_move(state, PlayerType.BLACK)
+        assert ChessEngine.get_all_legal_moves(state, PlayerType.BLACK) == []
+        assert ChessEngine.has_any_legal_move(state, PlayerType.WHITE)
+        assert ChessEngine.has_any_legal_move(state, PlayerType.WHITE)
+
+    def test_check_escaped_only_by_block(self):
+        """Test a check the king cannot step out of but a piece can block."""
+        board = [[NO_PIECE for _ in range(8)] for _ in range(8)]
+        board[7][0] = Piece(PieceType.KING, PlayerType.WHITE)  # King on a1
+        board[6][0] = Piece(PieceType.PAWN, PlayerType.WHITE)  # Pawn on a2
+        board[6][1] = Piece(PieceType.PAWN, PlayerType.WHITE)  # Pawn on b2
+        board[3][3] = Piece(PieceType.ROOK, PlayerType.WHITE)  # Rook on d5
+        board[7][7] = Piece(PieceType.ROOK, PlayerType.BLACK)  # Rook on h1
+        board[0][0] = Piece(PieceType.KING, PlayerType.BLACK)  # King on a8
+
+        # Back rank check: no king step is legal, only Rd1 blocks
+        assert ChessEngine.is_in_check(board, PlayerType.WHITE)
+        assert ChessEngine.has_any_legal_move(board, PlayerType.WHITE)
+        assert ChessEngine.get_all_legal_moves(board, PlayerType.WHITE) == [
+            (3, 3, 7, 3)
+        ]
 
     def test_not_checkmate_with_escape(self):
         """Test position that's check but not checkmate."""
@@ -409,6 +616,10 @@ class TestEnPassant:
             en_passant_target,  # e5xd6 e.p.
         )
 
+        # The target may also be given as a square index, -1 for none
+        assert ChessEngine.is_en_passant_move(board, 3, 4, 2, 3, 2 * 8 + 3)
+        assert not ChessEngine.is_en_passant_move(board, 3, 4, 2, 3, -1)
+
         # Not an en passant move if no target set
         assert not ChessEngine.is_en_passant_move(board, 3, 4, 2, 3, None)
 
@@ -517,6 +728,121 @@ class TestEnPassant:
         assert en_passant_move not in legal_moves
 
 
+class TestMoveGeneration:
+    """Test legal move generation."""
+
+    def test_start_position_move_counts(self):
+        """Test perft-style move counts from the starting position."""
+        state = BoardState.from_grid(create_default_board())
+        white_moves = ChessEngine.get_all_legal_moves(state, PlayerType.WHITE)
+        assert len(white_moves) == 20
+
+        # Every white reply leaves black with 20 moves (400 positions at depth 2)
+        total = 0
+        for from_row, from_col, to_row, to_col in white_moves:
+            after = BoardState.from_grid(state.to_grid())
+            after.move_piece(from_row * 8 + from_col, to_row * 8 + to_col)
+            total += len(ChessEngine.get_all_legal_moves(after, PlayerType.BLACK))
+        assert total == 400
+
+    def test_packed_move_codes(self):
+        """Test packed move ints decode to the tuple move list."""
+        state = BoardState.from_grid(create_default_board())
+        codes = ChessEngine.get_legal_move_codes(state, PlayerType.WHITE)
+
+        assert encode_move(6 * 8 + 4, 4 * 8 + 4) in codes  # e2-e4
+        assert decode_move(encode_move(6 * 8 + 4, 4 * 8 + 4)) == (6, 4, 4, 4)
+        assert [decode_move(move) for move in codes] == (
+            ChessEngine.get_all_legal_moves(state, PlayerType.WHITE)
+        )
+
+    def test_promotion_flag_on_packed_moves(self):
+        """Test packed pawn moves to the last rank carry the promotion flag."""
+        board = [[NO_PIECE for _ in range(8)] for _ in range(8)]
+        board[7][4] = Piece(PieceType.KING, PlayerType.WHITE)
+        board[0][7] = Piece(PieceType.KING, PlayerType.BLACK)
+        board[1][0] = Piece(PieceType.PAWN, PlayerType.WHITE)  # a7
+        board[6][1] = Piece(PieceType.PAWN, PlayerType.WHITE)  # b2
+
+        codes = ChessEngine.get_legal_move_codes(board, PlayerType.WHITE)
+        assert encode_move(1 * 8 + 0, 0 * 8 + 0, MOVE_PROMOTION) in codes
+        assert encode_move(6 * 8 + 1, 5 * 8 + 1) in codes
+        assert decode_move(encode_move(8, 0, MOVE_PROMOTION)) == (1, 0, 0, 0)
+
+    def test_ordered_moves(self):
+        """Test hash move first, then captures by MVV-LVA, then killers."""
+        board = [[NO_PIECE for _ in range(8)] for _ in range(8)]
+        board[7][4] = Piece(PieceType.KING, PlayerType.WHITE)  # e1
+        board[0][7] = Piece(PieceType.KING, PlayerType.BLACK)  # h8
+        board[3][3] = Piece(PieceType.QUEEN, PlayerType.BLACK)  # d5
+        board[3][1] = Piece(PieceType.PAWN, PlayerType.BLACK)  # b5
+        board[4][4] = Piece(PieceType.PAWN, PlayerType.WHITE)  # e4
+        board[5][2] = Piece(PieceType.KNIGHT, PlayerType.WHITE)  # c3
+
+        ordered = ChessEngine.get_all_legal_moves_ordered(
+            board,
+            PlayerType.WHITE,
+            tt_move=(7, 4, 6, 4),  # Ke2
+            killers=((7, 4, 7, 5),),  # Kf1
+        )
+        assert ordered[:5] == [
+            (7, 4, 6, 4),  # Hash move
+            (4, 4, 3, 3),  # exd5: pawn takes queen
+            (5, 2, 3, 3),  # Nxd5: knight takes queen
+            (5, 2, 3, 1),  # Nxb5: knight takes pawn
+            (7, 4, 7, 5),  # Killer move
+        ]
+        assert sorted(ordered) == sorted(
+            ChessEngine.get_all_legal_moves(board, PlayerType.WHITE)
+        )
+
+    def test_cached_moves_follow_position(self):
+        """Test cached move lists are independent and keyed by the position."""
+        state = BoardState.from_grid(create_default_board())
+        first = ChessEngine.get_all_legal_moves(state, PlayerType.WHITE)
+        first.clear()
+        assert len(ChessEngine.get_all_legal_moves(state, PlayerType.WHITE)) == 20
+
+        undo = state.make_move(6 * 8 + 4, 4 * 8 + 4)  # e2-e4
+        assert len(ChessEngine.get_all_legal_moves(state, PlayerType.WHITE)) == 30
+        state.unmake_move(undo)
+        assert len(ChessEngine.get_all_legal_moves(state, PlayerType.WHITE)) == 20
+
+    def test_castling_not_generated(self):
+        """Test castling is left to is_valid_castling."""
+        board = [[NO_PIECE for _ in range(8)] for _ in range(8)]
+        board[7][4] = Piece(PieceType.KING, PlayerType.WHITE)
+        board[7][7] = Piece(PieceType.ROOK, PlayerType.WHITE)
+
+        legal_moves = ChessEngine.get_all_legal_moves(board, PlayerType.WHITE)
+        assert (7, 4, 7, 6) not in legal_moves
+        assert (7, 4, 7, 5) in legal_moves
+
+    def test_pawn_moves_on_board_edges(self):
+        """Test set-wise pawn moves neither wrap files nor jump blockers."""
+        board = [[NO_PIECE for _ in range(8)] for _ in range(8)]
+        board[6][0] = Piece(PieceType.PAWN, PlayerType.WHITE)  # a2
+        board[6][7] = Piece(PieceType.PAWN, PlayerType.WHITE)  # h2
+        board[5][0] = Piece(PieceType.KNIGHT, PlayerType.BLACK)  # a3 blocks a2
+        board[4][7] = Piece(PieceType.BISHOP, PlayerType.BLACK)  # h4 stops h2-h4
+        board[1][7] = Piece(PieceType.PAWN, PlayerType.BLACK)  # h7
+        board[3][0] = Piece(PieceType.ROOK, PlayerType.WHITE)  # a5 across the edge
+
+        white_pawn_moves = {
+            move
+            for move in ChessEngine.get_all_legal_moves(board, PlayerType.WHITE)
+            if move[:2] in ((6, 0), (6, 7))
+        }
+        assert white_pawn_moves == {(6, 7, 5, 7)}
+
+        black_pawn_moves = {
+            move
+            for move in ChessEngine.get_all_legal_moves(board, PlayerType.BLACK)
+            if move[:2] == (1, 7)
+        }
+        assert black_pawn_moves == {(1, 7, 2, 7), (1, 7, 3, 7)}
+
+
 class TestPawnPromotion:
     """Test pawn promotion rules."""
 
@@ -677,6 +1003,190 @@ class TestChessNotation:
         )
         assert notation == "Rxe1"
 
+    def test_square_names(self):
+        """Test the precomputed algebraic square names."""
+        assert SQUARE_NAME[0] == "a8"
+        assert SQUARE_NAME[6 * 8 + 4] == "e2"
+        assert SQUARE_NAME[63] == "h1"
+
+
+class TestBitboards:
+    """Test the bitboard board representation."""
+
+    def test_grid_round_trip(self):
+        """Test converting a grid to bitboards and back."""
+        board = create_default_board()
+        state = BoardState.from_grid(board)
+
+        assert state.to_grid() == board
+        assert state.white_occ == 0xFFFF << 48
+        assert state.black_occ == 0xFFFF
+
+    def test_pieces_are_shared(self):
+        """Test pieces are immutable and empty squares use the NO_PIECE sentinel."""
+        state = BoardState.from_grid(create_default_board())
+
+        assert state.piece_at(4 * 8 + 4) is NO_PIECE
+        assert state.piece_at(0) is state.piece_at(0)
+        assert state.piece_at(0) == Piece(PieceType.ROOK, PlayerType.BLACK)
+        assert state.piece_at(0) is PIECES[PieceType.ROOK, PlayerType.BLACK]
+        assert create_default_board()[7][4] is state.piece_at(7 * 8 + 4)
+        assert len(set(map(id, PIECES.values()))) == 13
+        with pytest.raises(AttributeError):
+            state.piece_at(0).type = PieceType.QUEEN
+
+    def test_iter_bits(self):
+        """Test iterating the set squares of a bitboard."""
+        assert list(iter_bits(0)) == []
+        assert list(iter_bits((1 << 63) | (1 << 9) | 1)) == [0, 9, 63]
+
+    def test_find_king_on_bitboards(self):
+        """Test king lookup on a bitboard position."""
+        state = BoardState.from_grid(create_default_board())
+
+        assert find_king(state, PlayerType.WHITE) == (7, 4)
+        assert find_king(state, PlayerType.BLACK) == (0, 4)
+
+    def test_engine_accepts_bitboards(self):
+        """Test engine queries give the same answers for grids and bitboards."""
+        board = create_default_board()
+        state = BoardState.from_grid(board)
+
+        assert ChessEngine.is_valid_move(state, 6, 4, 4, 4)  # e2-e4
+        assert not ChessEngine.is_valid_move(state, 7, 0, 6, 0)  # Ra1-a2
+        assert ChessEngine.get_all_legal_moves(
+            state, PlayerType.WHITE
+        ) == ChessEngine.get_all_legal_moves(board, PlayerType.WHITE)
+
+    def test_leaper_attack_tables(self):
+        """Test precomputed knight and king attack sets."""
+        # Knight in the corner (a8) reaches b6 and c7 only
+        assert KNIGHT_ATTACKS[0] == (1 << 17) | (1 << 10)
+        # Knight in the centre reaches eight squares
+        assert KNIGHT_ATTACKS[4 * 8 + 4].bit_count() == 8
+        # King on h1 has three neighbours
+        assert KING_ATTACKS[63] == (1 << 62) | (1 << 55) | (1 << 54)
+
+    def test_pawn_attack_tables(self):
+        """Test pawn attack sets point forward and do not wrap around files."""
+        # White pawn on e2 attacks d3 and f3
+        assert PAWN_ATTACKS[WHITE][6 * 8 + 4] == (1 << 43) | (1 << 45)
+        # Black pawn on a7 only attacks b6
+        assert PAWN_ATTACKS[BLACK][1 * 8 + 0] == 1 << (2 * 8 + 1)
+        # White pawn on h2 only attacks g3
+        assert PAWN_ATTACKS[WHITE][6 * 8 + 7] == 1 << (5 * 8 + 6)
+
+    @pytest.mark.parametrize("sq", [0, 7, 27, 36, 56, 63])
+    def test_magic_slider_attacks(self, sq):
+        """Test magic lookups agree with walking the rays."""
+        for occ in (0, 0xFFFF00000000FFFF, 0x0000001818000000, 0x55AA55AA55AA55AA):
+            assert rook_attacks(sq, occ) == ray_attacks(sq, occ, ROOK_DIRECTIONS)
+            assert bishop_attacks(sq, occ) == ray_attacks(sq, occ, BISHOP_DIRECTIONS)
+
+    def test_incremental_zobrist_hash(self):
+        """Test the incrementally updated hash matches a full recompute."""
+        state = BoardState.from_grid(create_default_board())
+        start_hash = state.zobrist
+
+        state.move_piece(6 * 8 + 4, 4 * 8 + 4)  # e2-e4
+        state.move_piece(1 * 8 + 3, 3 * 8 + 3)  # d7-d5
+        state.move_piece(4 * 8 + 4, 3 * 8 + 3)  # exd5
+        assert state.zobrist == state.compute_zobrist()
+        assert state.zobrist != start_hash
+
+        state.clear_square(3 * 8 + 3)
+        assert state.zobrist == state.compute_zobrist()
+
+    def test_position_key(self):
+        """Test the repetition key covers side, castling rights and en passant."""
+        state = BoardState.from_grid(create_default_board())
+        start = ChessEngine.position_key(state, PlayerType.WHITE)
+
+        # Knights out and back reach the same key again
+        state.move_piece(7 * 8 + 6, 5 * 8 + 5)
+        state.move_piece(0 * 8 + 6, 2 * 8 + 5)
+        state.move_piece(5 * 8 + 5, 7 * 8 + 6)
+        state.move_piece(2 * 8 + 5, 0 * 8 + 6)
+        assert ChessEngine.position_key(state, PlayerType.WHITE) == start
+
+        assert ChessEngine.position_key(state, PlayerType.BLACK) != start
+        assert (
+            ChessEngine.position_key(
+                state, PlayerType.WHITE, CASTLE_ALL & ~CASTLE_WHITE_KINGSIDE
+            )
+            != start
+        )
+        assert (
+            ChessEngine.position_key(state, PlayerType.WHITE, en_passant_target=(5, 4))
+            != start
+        )
+
+    def test_int_codes_match_enums(self):
+        """Test the int codes round-trip to the public enums."""
+        assert PieceType.KING.code == KING
+        assert PieceType.NONE.code == 0
+        assert PlayerType.BLACK.code == BLACK
+        assert all(PIECE_TYPES[t.code] is t for t in PieceType)
+        assert all(PLAYERS[p.code] is p for p in PlayerType)
+
+    def test_mailbox_tracks_bitboards(self):
+        """Test the mailbox and occupancy stay in step with the bitboards."""
+        state = BoardState.from_grid(create_default_board())
+        assert state.mailbox[7 * 8 + 4] == mailbox_code(
+            PieceType.KING, PlayerType.WHITE
+        )
+        assert state.mailbox[0] == mailbox_code(PieceType.ROOK, PlayerType.BLACK)
+
+        copy = copy_board(state)
+        state.move_piece(7 * 8 + 6, 5 * 8 + 5)  # Ng1-f3
+        state.put_piece(1 * 8 + 0, PieceType.QUEEN, PlayerType.WHITE)  # on a7
+        rebuilt = BoardState.from_grid(state.to_grid())
+        assert state.mailbox == rebuilt.mailbox
+        assert state.white_occ == rebuilt.white_occ
+        assert state.black_occ == rebuilt.black_occ
+        assert state.zobrist == state.compute_zobrist()
+
+        assert BoardState.from_bytes(state.to_bytes()) == state
+
+        # Copies own their mailbox
+        assert copy.piece_at(7 * 8 + 6) == Piece(PieceType.KNIGHT, PlayerType.WHITE)
+        assert copy.mailbox[5 * 8 + 5] == 0
+
+    def test_make_unmake_and_king_square(self):
+        """Test make/unmake restores the position and tracks the kings."""
+        state = BoardState.from_grid(create_default_board())
+        before = state.copy()
+        assert state.king_sq == [7 * 8 + 4, 4]
+
+        undo_pawn = state.make_move(6 * 8 + 4, 4 * 8 + 4)  # e2-e4
+        undo_king = state.make_move(7 * 8 + 4, 6 * 8 + 4)  # Ke1-e2
+        assert state.king_sq[WHITE] == 6 * 8 + 4
+        assert find_king(state, PlayerType.WHITE) == (6, 4)
+
+        state.put_piece(5 * 8 + 4, PieceType.QUEEN, PlayerType.BLACK)  # on e3
+        undo_capture = state.make_move(6 * 8 + 4, 5 * 8 + 4)  # Kxe3
+        assert state.zobrist == state.compute_zobrist()
+
+        state.unmake_move(undo_capture)
+        assert state.piece_at(5 * 8 + 4) == Piece(PieceType.QUEEN, PlayerType.BLACK)
+        state.clear_square(5 * 8 + 4)
+        state.unmake_move(undo_king)
+        state.unmake_move(undo_pawn)
+        assert state == before
+        assert state.mailbox == before.mailbox
+        assert state.king_sq == before.king_sq
+        assert state.zobrist == before.zobrist
+
+    def test_check_test_does_not_mutate_board(self):
+        """Test would_leave_king_in_check leaves the caller's board untouched."""
+        board = create_default_board()
+        snapshot = [row.copy() for row in board]
+
+        assert not ChessEngine.would_leave_king_in_check(
+            board, 6, 4, 4, 4, PlayerType.WHITE
+        )
+        assert board == snapshot
+
 
 if __name__ == "__main__":
     # Run tests